@@ -277,7 +277,7 @@ class Window:
                     None,
                     lambda: os.write(self._master_fd, text.encode('utf-8'))
                 )
-                self.logger.debug(f"向 Shell 写入输入: {repr(text[:50])}")
+                self.logger.debug("向 Shell 写入输入: %r", text[:50])
             except Exception as e:
                 self.logger.error(f"写入 Shell 输入失败: {e}")
                 self.shell_exited = True
@@ -289,7 +289,7 @@ class Window:
             self.last_command_status = "running"  # 假设命令开始执行
             command = self.input_buffer + "\n"
             self.input_buffer = ""
-            self.logger.debug(f"提交命令: {repr(self.last_command[:50])}")
+            self.logger.debug("提交命令: %r", self.last_command[:50])
             await self.write_input(command)
 
     def get_visible_content(self) -> List[str]:
@@ -504,7 +504,7 @@ class TerminalManager:
         注意：逐字符输入时，每个字符单独调用此方法
         命令检查只在回车时进行
         """
-        self.logger.debug(f"接收输入: {repr(text[:50])}...")
+        self.logger.debug("接收输入: %r...", text[:50])
         # 处理转义：// → 特殊标记（用于字面的 /）
         text = text.replace("//", "\x00ESCAPED_SLASH\x00")
 
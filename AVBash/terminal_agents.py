@@ -5,6 +5,7 @@
 """
 
 import asyncio
+import logging
 from typing import List, Optional
 
 from driver.i_o_agent import InputAgent, OutputAgent
@@ -34,7 +35,8 @@ class TerminalInputAgent(InputAgent):
         """终端渲染更新回调"""
         self._last_render = render_text
         self._render_dirty = True
-        self.logger.debug(f"收到渲染更新，长度: {len(render_text)}")
+        if self.logger.is_enabled_for(logging.DEBUG):
+            self.logger.debug(f"收到渲染更新，长度: {len(render_text)}")
 
     def seek_signal(self, message: str):
         """根据 message 决定是否进行 seek - 终端被动输出，不主动 seek"""
@@ -56,7 +58,8 @@ class TerminalInputAgent(InputAgent):
         """收集渲染数据并重置 dirty 标志"""
         if self._render_dirty:
             self._render_dirty = False
-            self.logger.debug(f"收集数据，长度: {len(self._last_render)}")
+            if self.logger.is_enabled_for(logging.DEBUG):
+                self.logger.debug(f"收集数据，长度: {len(self._last_render)}")
             return self._last_render
         return ""
 
@@ -97,7 +100,7 @@ class TerminalOutputAgent(OutputAgent):
         执行接收到的数据
         data 包含来自其他 Agent 的输入字符和控制命令
         """
-        self.logger.debug(f"执行数据: {repr(data[:50])}...")
+        self.logger.debug("执行数据: %r...", data[:50])
         await self.terminal.feed_input(data)
 
     async def send_message(self, message: str):
@@ -146,7 +149,7 @@ class TerminalPair:
 
     async def send_command(self, command: str):
         """便捷方法：直接发送命令到终端"""
-        self.logger.debug(f"发送命令: {repr(command[:50])}...")
+        self.logger.debug("发送命令: %r...", command[:50])
         await self.terminal.feed_input(command)
 
     def set_render_callback(self, callback):
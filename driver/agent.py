@@ -88,20 +88,19 @@ class Agent(Loggable):
         """接收消息并加入输入队列"""
         queue_size_before = self.input_queue.qsize()
 
-        # 查找关键字
-        keyword_list = [x for x in self.input_connection if x[0] == sender]
-        if keyword_list:
-            keyword = keyword_list[0][1]
-
+        # 查找关键字（找到第一个匹配即停止，不构建完整列表）
+        keyword = next((kw for sid, kw in self.input_connection if sid == sender), None)
+        if keyword is not None:
             # 为关键字创建频率追踪器
-            if keyword not in self.keyword_frequency_trackers:
-                self.keyword_frequency_trackers[keyword] = ActivationFrequencyCalculator(
+            tracker = self.keyword_frequency_trackers.get(keyword)
+            if tracker is None:
+                tracker = self.keyword_frequency_trackers[keyword] = ActivationFrequencyCalculator(
                     window_size=10,
                     time_window_seconds=60.0,
                     agent_id=f"{self.id}.keyword.{keyword}"
                 )
 
-            self.keyword_frequency_trackers[keyword].record_activation()
+            tracker.record_activation()
         else:
             keyword = sender
 
@@ -131,13 +130,13 @@ class Agent(Loggable):
             })
             return
 
-        # 等待系统恢复（如果暂停）
+        # 等待系统恢复（如果暂停）；唤醒后重新检查，恢复后可能又被暂停
         while self.system and self.system.is_paused():
-            await asyncio.sleep(0.1)
+            await self.system.wait_until_resumed()
 
-        for uid in uids:
-            await self.message_bus.send_message(message, uid, self.id)
+        await self.message_bus.deliver_many(message, uids, self.id)
 
+        for uid in uids:
             # 记录消息流 (DETAIL/ARCH 日志)
             self.detail("message_flow", {
                 "source_agent": self.id,
@@ -160,10 +159,16 @@ class Agent(Loggable):
             "receivers_count": len(uids)
         })
 
+    def _mark_changed(self):
+        """通知系统本 Agent 的状态、连接或输入队列已改变（自动保存据此判断是否需要保存）"""
+        if self.system is not None:
+            self.system.mark_changed()
+
     def delete_input_connection(self, keyword: str):
         """删除指定关键字的输入连接"""
         deleted = [x for x in self.input_connection if x[1] == keyword]
         self.input_connection = [x for x in self.input_connection if x[1] != keyword]
+        self._mark_changed()
 
         for sender_id, _ in deleted:
             agent = self.system.get_agent(sender_id)
@@ -179,6 +184,7 @@ class Agent(Loggable):
         """删除指定 Agent 的输出连接"""
         before = len(self.output_connection)
         self.output_connection = [x for x in self.output_connection if x[1] != agent_id]
+        self._mark_changed()
         after = len(self.output_connection)
 
         self.info("output_connection_deleted", {
@@ -195,6 +201,7 @@ class Agent(Loggable):
 
         before = len(self.input_connection)
         self.input_connection.append((agent_id, keyword))
+        self._mark_changed()
         after = len(self.input_connection)
 
         self.info("input_connection_set", {
@@ -213,6 +220,7 @@ class Agent(Loggable):
 
         before = len(self.output_connection)
         self.output_connection.append((keyword, agent_id))
+        self._mark_changed()
         after = len(self.output_connection)
 
         self.info("output_connection_set", {
@@ -228,6 +236,7 @@ class Agent(Loggable):
         deleted = [x for x in self.output_connection if x[0] == keyword]
         before = len(self.output_connection)
         self.output_connection = [x for x in self.output_connection if x[0] != keyword]
+        self._mark_changed()
         after = len(self.output_connection)
 
         self.info("output_connection_deleted_by_keyword", {
@@ -246,6 +255,7 @@ class Agent(Loggable):
         """通过发送者 ID 删除输入连接"""
         before = len(self.input_connection)
         self.input_connection = [x for x in self.input_connection if x[0] != sender_id]
+        self._mark_changed()
         after = len(self.input_connection)
 
         self.info("input_connection_deleted_by_id", {
@@ -304,6 +314,7 @@ class Agent(Loggable):
                 remaining.append((sender_id, kw))
 
         self.input_connection = remaining
+        self._mark_changed()
 
         # 通知允许删除的对应对应删除他们的输出连接
         for sender_id, _ in deleted:
@@ -341,6 +352,7 @@ class Agent(Loggable):
                 remaining.append((kw, receiver_id))
 
         self.output_connection = remaining
+        self._mark_changed()
 
         # 通知允许删除的对应对应删除他们的输入连接
         for _, receiver_id in deleted:
@@ -368,6 +380,7 @@ class Agent(Loggable):
                 new_connections.append((sender_id, keyword))
 
         self.input_connection = new_connections
+        self._mark_changed()
 
         if updated:
             self.info("input_connection_keyword_updated", {
@@ -389,6 +402,7 @@ class Agent(Loggable):
                 new_connections.append((keyword, receiver_id))
 
         self.output_connection = new_connections
+        self._mark_changed()
 
         if updated:
             self.info("output_connection_keyword_updated", {
@@ -405,6 +419,7 @@ class Agent(Loggable):
             else:
                 new_connections.append((sid, keyword))
         self.input_connection = new_connections
+        self._mark_changed()
 
     def update_output_connection_keyword_for_receiver(self, receiver_id: str, old_keyword: str, new_keyword: str):
         """由对方调用，更新指定接收者的输出连接关键词"""
@@ -415,6 +430,7 @@ class Agent(Loggable):
             else:
                 new_connections.append((keyword, rid))
         self.output_connection = new_connections
+        self._mark_changed()
 
     def get_frequency_stats(self) -> dict:
         """获取激活频率统计"""
@@ -452,6 +468,10 @@ class Agent(Loggable):
                 message_sending += 1
                 await self.send_message(content, keyword)
 
+        # 状态与连接可能已改变
+        if matches:
+            self._mark_changed()
+
         self.info("response_processed", {
             "state_updates": state_updates,
             "signal_processing": signal_processing,
@@ -669,3 +689,4 @@ class Agent(Loggable):
             })
             for msg in messages:
                 self.input_queue.put_nowait(msg)
+            self._mark_changed()
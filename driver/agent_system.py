@@ -6,13 +6,17 @@ AVM2 Agent 系统模块
 """
 
 import asyncio
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Iterable, List, Optional
 from utils.visual_monitor.unified_logger import Loggable
 
 
 class MessageBus(Loggable):
     """消息总线 - 负责在 Agent 之间路由消息"""
 
+    # 异步快照的最小采集间隔（秒）：采集需要遍历全部 Task，监控端只展示最新一份
+    _SNAPSHOT_INTERVAL = 0.1
+
     def __init__(self):
         super().__init__()
         self.agents: Dict[str, 'Agent'] = {}
@@ -21,6 +25,10 @@ class MessageBus(Loggable):
         self._message_paused = False      # 消息暂停标志
         self._message_delay = 0.0         # 消息延迟（秒）
         self._control_lock = asyncio.Lock()  # 控制锁
+        self._resume_event = asyncio.Event()  # 恢复事件（未暂停时处于 set 状态）
+        self._resume_event.set()
+        self._last_snapshot_time = 0.0    # 上次记录异步快照的时间（monotonic）
+        self.delivery_count = 0           # 累计投递次数（自动保存据此判断系统是否有变化）
 
         self.info("message_bus_created", {
             "initial_agents_count": 0
@@ -37,6 +45,16 @@ class MessageBus(Loggable):
             "agents_count_after": after_count
         })
 
+    def register_agents(self, agents: Iterable['Agent']):
+        """批量注册 Agent 到消息总线（一次 dict.update，一条日志）"""
+        before_count = len(self.agents)
+        self.agents.update((agent.id, agent) for agent in agents)
+        after_count = len(self.agents)
+        self.info("agents_registered", {
+            "agents_count_before": before_count,
+            "agents_count_after": after_count
+        })
+
     def unregister_agent(self, agent_id: str):
         """从消息总线注销 Agent"""
         before_count = len(self.agents)
@@ -60,29 +78,74 @@ class MessageBus(Loggable):
         - 如果网络暂停，会阻塞等待恢复
         - 如果设置了延迟，会等待指定时间
         """
-        # 检查是否暂停 - 等待恢复
+        await self._wait_for_delivery()
+        self._deliver(message, receiver_id, sender_id)
+
+    async def deliver_many(self, message: str, receiver_ids: List[str], sender_id: str):
+        """
+        将同一条消息批量发送给多个 Agent（支持全局控制）
+
+        设置了延迟时与逐个调用 send_message 一致，每个接收者都单独
+        等待暂停与延迟；延迟为 0 时只等待一次暂停，随后在同一次调度中
+        依次投递，避免扇出时为每个接收者分别挂起一次
+        """
+        if self._message_delay > 0:
+            for receiver_id in receiver_ids:
+                await self._wait_for_delivery()
+                self._deliver(message, receiver_id, sender_id)
+            return
+
+        await self._wait_for_delivery()
+        for receiver_id in receiver_ids:
+            self._deliver(message, receiver_id, sender_id)
+
+    async def _wait_for_delivery(self):
+        """等待暂停恢复并应用消息延迟"""
+        # 检查是否暂停 - 直接等待恢复事件，避免轮询；
+        # 唤醒后重新检查：恢复后可能在本协程运行前又被暂停
         while self._message_paused:
-            await asyncio.sleep(0.1)
+            await self.wait_until_resumed()
 
         # 应用延迟
         if self._message_delay > 0:
             await asyncio.sleep(self._message_delay)
 
+    def _deliver(self, message: str, receiver_id: str, sender_id: str):
+        """
+        投递消息到接收者的输入队列
+
+        热路径只做字典查找与入队；常规日志写入通过 call_soon
+        推迟到当前调度之后，发送方不再同步等待日志 I/O
+        """
+        self.delivery_count += 1
+        receiver = self.agents.get(receiver_id)
+        if receiver is not None:
+            receiver.receive_message(message, sender_id)
+
+        # 记录异步快照 (ARCH 日志)，需要在当前任务上下文中采集；
+        # 先做时间比较，间隔未到时跳过整个 Task 遍历
+        now = time.monotonic()
+        if now - self._last_snapshot_time >= self._SNAPSHOT_INTERVAL:
+            self._last_snapshot_time = now
+            self.arch("async_snapshot", {
+                "operation": "message_routing",
+                "sender_id": sender_id,
+                "receiver_id": receiver_id
+            })
+
+        asyncio.get_running_loop().call_soon(
+            self._log_delivery, sender_id, receiver_id, len(message), receiver is not None
+        )
+
+    def _log_delivery(self, sender_id: str, receiver_id: str, message_length: int, delivered: bool):
+        """记录消息投递日志（冷路径）"""
         self.debug("message_routing", {
             "sender_id": sender_id,
             "receiver_id": receiver_id,
-            "message_length": len(message)
-        })
-
-        # 记录异步快照 (ARCH 日志)
-        self.arch("async_snapshot", {
-            "operation": "message_routing",
-            "sender_id": sender_id,
-            "receiver_id": receiver_id
+            "message_length": message_length
         })
 
-        if receiver_id in self.agents:
-            self.agents[receiver_id].receive_message(message, sender_id)
+        if delivered:
             self.info("message_delivered", {
                 "sender_id": sender_id,
                 "receiver_id": receiver_id,
@@ -100,13 +163,19 @@ class MessageBus(Loggable):
     def pause_messages(self):
         """暂停消息传递"""
         self._message_paused = True
+        self._resume_event.clear()
         self.info("messages_paused", {})
 
     def resume_messages(self):
         """恢复消息传递"""
         self._message_paused = False
+        self._resume_event.set()
         self.info("messages_resumed", {})
 
+    async def wait_until_resumed(self):
+        """等待消息传递恢复（未暂停时立即返回）"""
+        await self._resume_event.wait()
+
     def set_message_delay(self, seconds: float):
         """
         设置消息延迟（秒）
@@ -152,13 +221,28 @@ class AgentSystem(Loggable):
         self.message_bus = MessageBus()
         self.io_agents: List['InputOutputAgent'] = []
         self._system_running = False
+        self._change_count = 0  # 消息投递以外的变化次数（增删 Agent、Agent 状态/连接/输入队列变化）
 
         self.info("agent_system_created", {
             "initial_agents_count": 0
         })
 
+    @property
+    def mutation_counter(self) -> int:
+        """
+        系统变化计数：消息投递与其它变化次数之和
+
+        两次读取的值相同说明期间系统没有变化，自动保存可以跳过
+        """
+        return self.message_bus.delivery_count + self._change_count
+
+    def mark_changed(self):
+        """记录一次消息投递以外的变化"""
+        self._change_count += 1
+
     def add_agent(self, agent):
         """添加 Agent 到系统"""
+        self.mark_changed()
         before_count = len(self.agents)
         self.agents[agent.id] = agent
         self.message_bus.register_agent(agent)
@@ -180,6 +264,33 @@ class AgentSystem(Loggable):
             "agents_count_after": after_count
         })
 
+    def add_agents(self, agents: Iterable['Agent']):
+        """批量添加 Agent 到系统，消息总线只更新一次"""
+        agents = list(agents)
+        self.mark_changed()
+        before_count = len(self.agents)
+        self.agents.update((agent.id, agent) for agent in agents)
+        self.message_bus.register_agents(agents)
+
+        has_monitor = hasattr(self, 'frequency_monitor')
+        for agent in agents:
+            agent.message_bus = self.message_bus
+            agent.system = self
+
+            if has_monitor:
+                self.frequency_monitor.register_agent(agent.id)
+
+            if self._system_running and hasattr(agent, 'start_processing'):
+                asyncio.ensure_future(agent.start_processing())
+
+        after_count = len(self.agents)
+
+        self.info("agents_added", {
+            "agent_ids": [agent.id for agent in agents],
+            "agents_count_before": before_count,
+            "agents_count_after": after_count
+        })
+
     def add_io_agent(self, agent):
         """添加 I/O Agent 到系统"""
         self.info("io_agent_added", {
@@ -235,6 +346,7 @@ class AgentSystem(Loggable):
     def remove_agent(self, agent_id: str):
         """从系统移除 Agent"""
         if agent_id in self.agents:
+            self.mark_changed()
             before_count = len(self.agents)
             self.message_bus.unregister_agent(agent_id)
             del self.agents[agent_id]
@@ -313,6 +425,10 @@ class AgentSystem(Loggable):
         """检查系统是否暂停"""
         return self.message_bus.is_message_paused()
 
+    async def wait_until_resumed(self):
+        """等待网络恢复（未暂停时立即返回）"""
+        await self.message_bus.wait_until_resumed()
+
     def get_status(self) -> dict:
         """获取系统状态"""
         return {
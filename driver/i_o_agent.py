@@ -262,8 +262,7 @@ class InputAgent(InputOutputAgent, ABC):
             receiver_ids=self.output_connections
         )
 
-        for receiver_id in self.output_connections:
-            await self.message_bus.send_message(data, receiver_id, self.id)
+        await self.message_bus.deliver_many(data, self.output_connections, self.id)
 
         self.info("data_sent", {
             "data_length": len(data),
@@ -4,6 +4,7 @@ Agent 网络管理类
 用于创建和管理 Agent 之间的连接网络，提供与 I/O Agent 的集成接口
 """
 
+import logging
 import random
 from typing import List, Dict, Optional, Tuple
 
@@ -59,12 +60,14 @@ class AgentNetwork:
         for i in range(num_agents):
             agent = Agent()
             self.agents.append(agent)
-            self.system.add_agent(agent)
 
             # 初始化连接记录
             self.input_connections[agent.id] = []
             self.output_connections[agent.id] = []
 
+        # 一次性批量加入系统
+        self.system.add_agents(self.agents)
+
         # 随机初始化连接（占位实现）
         self._random_initialize_connections()
 
@@ -83,6 +86,7 @@ class AgentNetwork:
 
         # 每个 Agent 随机连接到其他 1-3 个 Agent
         connection_count = 0
+        debug_enabled = self.logger.is_enabled_for(logging.DEBUG)
         for agent in self.agents:
             # 随机选择目标 Agent（排除自己）
             possible_targets = [a for a in self.agents if a.id != agent.id]
@@ -103,7 +107,8 @@ class AgentNetwork:
                 self.output_connections[agent.id].append((keyword, target.id))
                 self.input_connections[target.id].append((agent.id, keyword))
                 connection_count += 1
-                self.logger.debug(f"连接: {agent.id[:8]} -> {target.id[:8]} (关键字: {keyword})")
+                if debug_enabled:
+                    self.logger.debug(f"连接: {agent.id[:8]} -> {target.id[:8]} (关键字: {keyword})")
 
         self.logger.info(f"随机初始化连接完成，共 {connection_count} 个连接")
 
@@ -11,6 +11,11 @@ import asyncio
 import signal
 import sys
 
+try:
+    import uvloop
+except ImportError:  # uvloop 为可选依赖
+    uvloop = None
+
 from driver import AgentSystem
 from utils.logger import LoggerFactory
 from driver.net import AgentNetwork
@@ -207,4 +212,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        # uvloop.install() 已弃用，由 uvloop.run 创建事件循环
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
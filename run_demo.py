@@ -4,16 +4,11 @@ AVM2 可视化监控演示
 启动监控服务器并生成测试数据
 """
 
-import sys
-import os
 import asyncio
 import time
 import random
 import threading
 
-# 添加项目根目录到路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
 from utils.visual_monitor.unified_logger import unified_logger, LogMode, Loggable
 from utils.visual_monitor.server import run_async_server
 
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+检查点管理器测试
+覆盖元数据旁路文件、压缩格式与增量检查点（数据块存储与清理）
+"""
+
+from pathlib import Path
+
+import pytest
+
+from driver.agent import Agent
+from driver.agent_system import AgentSystem
+from utils.persistence.checkpoint_manager import CheckpointManager
+
+
+def _make_system(agent_count: int = 2) -> AgentSystem:
+    """构建最小的可保存系统（AgentSystem 本身没有 explore_agent 属性，保存路径需要它）"""
+    system = AgentSystem()
+    system.explore_agent = []
+    agents = []
+    for i in range(agent_count):
+        agent = Agent()
+        agent.state = f"state-{i}"
+        agents.append(agent)
+    system.add_agents(agents)
+    return system
+
+
+def _entries(manager: CheckpointManager) -> dict:
+    return {Path(c['file']).name: c for c in manager.list_checkpoints()}
+
+
+def test_plain_and_gzip_checkpoints_have_separate_sidecars(tmp_path):
+    plain = CheckpointManager(tmp_path)
+    compressed = CheckpointManager(tmp_path, compress=True)
+    plain.save_checkpoint(_make_system(1), "x")
+    compressed.save_checkpoint(_make_system(3), "x")
+
+    entries = _entries(plain)
+    assert set(entries) == {"x.json", "x.json.gz"}
+    assert entries["x.json"]['agent_count'] == 1
+    assert entries["x.json.gz"]['agent_count'] == 3
+
+
+def test_checkpoint_named_like_a_sidecar_is_listed(tmp_path):
+    manager = CheckpointManager(tmp_path)
+    checkpoint_file = manager.save_checkpoint(_make_system(1), "notes.meta")
+
+    entries = _entries(manager)
+    assert Path(checkpoint_file).name in entries
+    assert entries["notes.meta.json"]['name'] == "notes.meta"
+
+
+def test_delete_removes_only_its_own_sidecar(tmp_path):
+    plain = CheckpointManager(tmp_path)
+    compressed = CheckpointManager(tmp_path, compress=True)
+    plain_file = plain.save_checkpoint(_make_system(1), "x")
+    gzip_file = compressed.save_checkpoint(_make_system(3), "x")
+
+    assert plain.delete_checkpoint(plain_file)
+
+    assert not Path(plain_file).exists()
+    assert not (tmp_path / "meta" / "x.json.meta.json").exists()
+    assert (tmp_path / "meta" / "x.json.gz.meta.json").exists()
+    entries = _entries(plain)
+    assert list(entries) == ["x.json.gz"]
+    assert entries["x.json.gz"]['agent_count'] == 3
+    assert Path(gzip_file).exists()
+
+
+def test_delete_clears_sidecar_left_by_missing_checkpoint(tmp_path):
+    manager = CheckpointManager(tmp_path)
+    checkpoint_file = manager.save_checkpoint(_make_system(1), "gone")
+    Path(checkpoint_file).unlink()
+
+    assert manager.list_checkpoints() == []
+    assert manager.delete_checkpoint(checkpoint_file)
+    assert not (tmp_path / "meta" / "gone.json.meta.json").exists()
+    assert not manager.delete_checkpoint(checkpoint_file)
+
+
+def _blobs(tmp_path) -> set:
+    blob_dir = tmp_path / "agents"
+    return {p.name for p in blob_dir.iterdir()} if blob_dir.is_dir() else set()
+
+
+def _states(system: AgentSystem) -> dict:
+    return {agent_id: agent.state for agent_id, agent in system.agents.items()}
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_incremental_round_trip(tmp_path, compress):
+    manager = CheckpointManager(tmp_path, compress=compress)
+    system = _make_system(3)
+    checkpoint_file = manager.save_checkpoint(system, "inc", incremental=True)
+
+    assert len(_blobs(tmp_path)) == 3
+    restored = manager.load_checkpoint(checkpoint_file)
+    assert _states(restored) == _states(system)
+    assert _entries(manager)[Path(checkpoint_file).name]['agent_count'] == 3
+
+
+def test_unchanged_agents_reuse_blobs(tmp_path):
+    manager = CheckpointManager(tmp_path)
+    system = _make_system(3)
+    manager.save_checkpoint(system, "first", incremental=True)
+    before = _blobs(tmp_path)
+
+    manager.save_checkpoint(system, "second", incremental=True)
+    assert _blobs(tmp_path) == before
+
+    next(iter(system.agents.values())).state = "changed"
+    manager.save_checkpoint(system, "third", incremental=True)
+    assert len(_blobs(tmp_path) - before) == 1
+
+
+def test_delete_collects_unreferenced_blobs(tmp_path):
+    manager = CheckpointManager(tmp_path)
+    system = _make_system(2)
+    first = manager.save_checkpoint(system, "first", incremental=True)
+    next(iter(system.agents.values())).state = "changed"
+    second = manager.save_checkpoint(system, "second", incremental=True)
+    assert len(_blobs(tmp_path)) == 3
+
+    assert manager.delete_checkpoint(first)
+    assert len(_blobs(tmp_path)) == 2
+    assert _states(manager.load_checkpoint(second)) == _states(system)
+
+    assert manager.delete_checkpoint(second)
+    assert _blobs(tmp_path) == set()
+
+
+def test_full_checkpoints_keep_blobs_of_incremental_ones(tmp_path):
+    manager = CheckpointManager(tmp_path)
+    system = _make_system(2)
+    incremental = manager.save_checkpoint(system, "inc", incremental=True)
+    full = manager.save_checkpoint(system, "full")
+    before = _blobs(tmp_path)
+
+    assert manager.delete_checkpoint(full)
+    assert _blobs(tmp_path) == before
+    assert manager.cleanup_blobs() == 0
+    assert _states(manager.load_checkpoint(incremental)) == _states(system)
+
+
+def test_plain_and_gzip_incremental_checkpoints_share_directory(tmp_path):
+    plain = CheckpointManager(tmp_path)
+    compressed = CheckpointManager(tmp_path, compress=True)
+    system = _make_system(2)
+    plain_file = plain.save_checkpoint(system, "x", incremental=True)
+    gzip_file = compressed.save_checkpoint(system, "x", incremental=True)
+    assert len(_blobs(tmp_path)) == 4  # .json 与 .json.gz 数据块分别存放
+
+    assert plain.delete_checkpoint(plain_file)
+    assert len(_blobs(tmp_path)) == 2
+    assert _states(compressed.load_checkpoint(gzip_file)) == _states(system)
+
+
+def test_cleanup_keeps_blobs_when_a_checkpoint_is_unreadable(tmp_path):
+    manager = CheckpointManager(tmp_path)
+    manager.save_checkpoint(_make_system(2), "inc", incremental=True)
+    (tmp_path / "broken.json").write_bytes(b"{not json")
+    before = _blobs(tmp_path)
+    (tmp_path / "agents" / "orphan.json").write_bytes(b"{}")
+
+    assert manager.cleanup_blobs() == 0
+    assert _blobs(tmp_path) == before | {"orphan.json"}
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
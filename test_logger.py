@@ -106,6 +106,22 @@ detail_logger.log_arch("DirectTest", "direct_arch_event", {
 
 print("已直接调用 detail_logger 方法")
 
+# 测试 5.1: 日志级别（AVM2_LOG_LEVEL / LoggerFactory.set_level）
+print()
+print("测试 5.1: 日志级别")
+print("-" * 40)
+
+import logging
+
+original_level = LoggerFactory.get_level()
+LoggerFactory.set_level(logging.INFO)
+assert not logger1.is_enabled_for(logging.DEBUG), "INFO 级别下 DEBUG 应被跳过"
+assert logger1.is_enabled_for(logging.INFO)
+logger1.debug("这条 DEBUG 日志不应写入文件")
+LoggerFactory.set_level(original_level)
+assert logger1.is_enabled_for(logging.DEBUG) == (original_level <= logging.DEBUG)
+print(f"✓ set_level 生效，当前级别：{logging.getLevelName(LoggerFactory.get_level())}")
+
 # 等待一下让异步日志写入
 time.sleep(0.5)
 
@@ -146,6 +162,8 @@ print("- 修改 AVM2_LOG_MODE 环境变量切换模式:")
 print("  CONTENT: 仅基础日志")
 print("  DETAIL:  基础日志 + 程序细节")
 print("  ARCH:    基础日志 + 程序细节 + 架构还原")
+print("- 修改 AVM2_LOG_LEVEL 环境变量设置基础日志级别（默认 DEBUG）:")
+print("  设为 INFO 及以上时，DEBUG 日志在格式化之前即被跳过")
 print()
 print("日志文件位置:")
 print("- 基础日志：logs/<模块名>.log")
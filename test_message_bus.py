@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+消息总线测试
+覆盖暂停/恢复与消息延迟的投递行为
+"""
+
+import asyncio
+
+from driver.agent import Agent
+from driver.agent_system import AgentSystem, MessageBus
+
+
+class _Receiver:
+    """只记录收到的消息的最小接收者"""
+
+    def __init__(self, agent_id: str):
+        self.id = agent_id
+        self.received = []
+
+    def receive_message(self, message: str, sender: str):
+        self.received.append((sender, message))
+
+
+def test_pause_resume_pause_keeps_message_queued():
+    async def scenario():
+        bus = MessageBus()
+        receiver = _Receiver("r")
+        bus.register_agent(receiver)
+
+        bus.pause_messages()
+        task = asyncio.create_task(bus.send_message("m", "r", "s"))
+        await asyncio.sleep(0)
+
+        # 恢复后立即再次暂停：等待中的发送者被唤醒，但不能在暂停状态下投递
+        bus.resume_messages()
+        bus.pause_messages()
+        await asyncio.sleep(0.05)
+        assert bus.is_message_paused()
+        assert receiver.received == []
+
+        bus.resume_messages()
+        await asyncio.wait_for(task, 1)
+        assert receiver.received == [("s", "m")]
+
+    asyncio.run(scenario())
+
+
+def test_agent_send_message_rechecks_pause():
+    async def scenario():
+        system = AgentSystem()
+        sender = Agent()
+        receiver = _Receiver("r")
+        system.add_agent(sender)
+        system.message_bus.register_agent(receiver)
+        sender.set_output_connection("r", "kw")
+
+        system.pause()
+        task = asyncio.create_task(sender.send_message("m", "kw"))
+        await asyncio.sleep(0)
+
+        system.resume()
+        system.pause()
+        await asyncio.sleep(0.05)
+        assert receiver.received == []
+
+        system.resume()
+        await asyncio.wait_for(task, 1)
+        assert receiver.received == [(sender.id, "m")]
+
+    asyncio.run(scenario())
+
+
+def test_deliver_many_applies_delay_per_receiver():
+    async def scenario():
+        bus = MessageBus()
+        receivers = [_Receiver(f"r{i}") for i in range(3)]
+        for receiver in receivers:
+            bus.register_agent(receiver)
+
+        bus.set_message_delay(0.05)
+        task = asyncio.create_task(bus.deliver_many("m", [r.id for r in receivers], "s"))
+
+        # 与逐个 send_message 相同：每过一个延迟周期只投递一个接收者
+        await asyncio.sleep(0.075)
+        assert [len(r.received) for r in receivers] == [1, 0, 0]
+
+        await asyncio.wait_for(task, 1)
+        assert all(r.received == [("s", "m")] for r in receivers)
+
+    asyncio.run(scenario())
+
+
+def test_deliver_many_without_delay_delivers_in_one_pass():
+    async def scenario():
+        bus = MessageBus()
+        receivers = [_Receiver(f"r{i}") for i in range(3)]
+        for receiver in receivers:
+            bus.register_agent(receiver)
+
+        await bus.deliver_many("m", [r.id for r in receivers], "s")
+        assert all(r.received == [("s", "m")] for r in receivers)
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_pause_resume_pause_keeps_message_queued()
+    test_agent_send_message_rechecks_pause()
+    test_deliver_many_applies_delay_per_receiver()
+    test_deliver_many_without_delay_delivers_in_one_pass()
+    print("消息总线测试通过")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+LLM 日志统计测试
+验证 count_llm_calls 的按标记计数与逐行解析结果一致
+"""
+
+import json
+
+from utils.view_llm_logs import _count_records
+
+
+def _llm_call(compact: bool) -> bytes:
+    entry = {
+        "timestamp": "2024-01-01 00:00:00",
+        "agent_id": "agent-1",
+        "model": "test-model",
+        "input": {
+            "system_prompt": 'system "model": "x"',
+            "user_prompt": '{"type": "input_agent_message"}'
+        },
+        "output": "ok",
+        "response_time": 0.1,
+        "tokens_used": 10
+    }
+    separators = (',', ':') if compact else None
+    return json.dumps(entry, ensure_ascii=False, separators=separators).encode('utf-8')
+
+
+def _message(log_type: str, compact: bool) -> bytes:
+    entry = {"timestamp": "2024-01-01 00:00:00", "type": log_type, "agent_id": "io", "message": "m"}
+    separators = (',', ':') if compact else None
+    return json.dumps(entry, ensure_ascii=False, separators=separators).encode('utf-8')
+
+
+def test_blank_lines_are_not_counted():
+    data = b"".join([
+        b"\n\n",                                    # 开头的空行
+        _llm_call(True), b"\n",
+        b"\n\n\n",                                  # 连续空行
+        _llm_call(False), b"\n",
+        b"   \t\n",                                 # 空白行
+        b"\r\n\r\n",                                # CRLF 空行
+        _message("input_agent_message", True), b"\n",
+        _message("output_agent_message", False), b"\r\n",
+        b"\n",
+    ])
+    assert _count_records(data) == (2, 1, 1)
+
+
+def test_trailing_partial_line_is_skipped():
+    partial = _llm_call(True)[:40]
+    data = _llm_call(True) + b"\n\n\n" + _message("input_agent_message", True) + b"\n" + partial
+    assert _count_records(data) == (1, 1, 0)
+
+
+def test_trailing_complete_line_without_newline_is_counted():
+    data = _llm_call(True) + b"\n" + _message("output_agent_message", True)
+    assert _count_records(data) == (1, 0, 1)
+
+
+def test_empty_data():
+    assert _count_records(b"") == (0, 0, 0)
+    assert _count_records(b"\n\n  \n") == (0, 0, 0)
+
+
+if __name__ == "__main__":
+    test_blank_lines_are_not_counted()
+    test_trailing_partial_line_is_skipped()
+    test_trailing_complete_line_without_newline_is_counted()
+    test_empty_data()
+    print("LLM 日志统计测试通过")
@@ -4,15 +4,10 @@
 生成一些测试日志数据来验证监控系统工作正常
 """
 
-import sys
-import os
 import time
 import json
 import random
 
-# 添加项目根目录到路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
 from utils.visual_monitor.unified_logger import unified_logger, Loggable, LogMode
 
 # 设置模式
@@ -12,25 +12,26 @@ from datetime import datetime
 from typing import Optional
 
 
-class AgentMessageLogger:
-    """Agent 消息日志记录器 - 每个 Agent 一个文件"""
+# driver.agent 的预提示词，首次记录时导入（driver.agent 导入本模块，不能在顶层导入）
+_pre_prompt: Optional[str] = None
 
-    _instance = None
-    _initialized = False
 
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+def _get_pre_prompt() -> str:
+    """获取并缓存预提示词"""
+    global _pre_prompt
+    if _pre_prompt is None:
+        from driver.agent import pre_prompt
+        _pre_prompt = pre_prompt
+    return _pre_prompt
 
-    def __init__(self, log_dir: str = "logs/Agent_log"):
-        if self._initialized:
-            return
 
+class AgentMessageLogger:
+    """Agent 消息日志记录器 - 每个 Agent 一个文件（使用模块级实例 agent_message_logger）"""
+
+    def __init__(self, log_dir: str = "logs/Agent_log"):
         self.log_dir = Path(log_dir)
         self.archive_dir = Path("logs/Agent_log_old")
         self._file_handles: dict = {}
-        self._initialized = True
 
         # 创建目录
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -63,11 +64,12 @@ class AgentMessageLogger:
             print(f"AgentMessageLogger: Failed to archive logs: {e}")
 
     def _get_file_handle(self, agent_id: str):
-        """获取或创建文件句柄"""
-        if agent_id not in self._file_handles:
+        """获取或创建文件句柄（按 Agent 缓存，只在首次记录时打开）"""
+        fh = self._file_handles.get(agent_id)
+        if fh is None:
             log_file = self.log_dir / f"{agent_id}.log"
-            self._file_handles[agent_id] = open(log_file, 'a', encoding='utf-8')
-        return self._file_handles[agent_id]
+            fh = self._file_handles[agent_id] = open(log_file, 'a', encoding='utf-8')
+        return fh
 
     def log_message(self, agent_id: str, system_prompt: str, user_prompt: str,
                     input_messages: list, state: str):
@@ -85,12 +87,12 @@ class AgentMessageLogger:
             fh = self._get_file_handle(agent_id)
 
             # 简化系统提示词：用 [PRE_PROMPT] 代替实际的预提示词
-            from driver.agent import pre_prompt
-            simplified_system = system_prompt.replace(pre_prompt, "[PRE_PROMPT]")
+            simplified_system = system_prompt.replace(_get_pre_prompt(), "[PRE_PROMPT]")
 
-            # 构建日志条目
+            # 构建日志条目：各段放入列表后一次 join，避免逐段 += 反复复制
             timestamp = datetime.now().isoformat()
-            log_entry = f"""
+            parts = [
+                f"""
 {'='*80}
 [{timestamp}] Agent: {agent_id}
 {'-'*80}
@@ -102,15 +104,15 @@ User Prompt:
 {'-'*80}
 Input Messages ({len(input_messages)}):
 """
-            for msg in input_messages:
-                log_entry += f"  - {msg}\n"
-
-            log_entry += f"""{'-'*80}
+            ]
+            parts.extend(f"  - {msg}\n" for msg in input_messages)
+            parts.append(f"""{'-'*80}
 State:
 {state[:500]}...
 {'='*80}
 
-"""
+""")
+            log_entry = "".join(parts)
             fh.write(log_entry)
             fh.flush()
 
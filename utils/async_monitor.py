@@ -154,6 +154,72 @@ class AsyncMonitor:
             "event_loop": AsyncMonitor.get_event_loop_info()
         }
 
+    @staticmethod
+    def collect_log_context() -> Dict[str, Any]:
+        """
+        收集写入日志条目的精简异步上下文（UnifiedLogger 与 DetailLogger 共用）
+
+        包括：
+        - 当前 Task 信息
+        - 所有活跃 Task 列表
+        - 事件循环状态
+
+        Returns:
+            dict: 包含 current_task, all_tasks, event_loop 的字典
+        """
+        context = {
+            "current_task": None,
+            "all_tasks": [],
+            "event_loop": None
+        }
+
+        try:
+            # 获取当前任务
+            try:
+                current_task = asyncio.current_task()
+                if current_task:
+                    coro = current_task.get_coro()
+                    context["current_task"] = {
+                        "task_id": id(current_task),
+                        "task_name": current_task.get_name(),
+                        "coro_name": getattr(coro, '__qualname__', str(coro)),
+                        "stack_depth": len(current_task.get_stack()) if hasattr(current_task, 'get_stack') else 0
+                    }
+            except RuntimeError:
+                # 当前没有正在运行的任务
+                pass
+
+            # 获取所有任务
+            try:
+                all_tasks = asyncio.all_tasks()
+                context["all_tasks"] = [
+                    {
+                        "task_id": id(t),
+                        "task_name": t.get_name(),
+                        "coro_name": getattr(t.get_coro(), '__qualname__', str(t.get_coro()))
+                    }
+                    for t in all_tasks
+                ]
+            except RuntimeError:
+                pass
+
+            # 获取事件循环信息
+            try:
+                loop = asyncio.get_event_loop()
+                context["event_loop"] = {
+                    "loop_id": id(loop),
+                    "is_running": loop.is_running(),
+                    "is_closed": loop.is_closed(),
+                    "default_executor": loop._default_executor is not None if hasattr(loop, '_default_executor') else None
+                }
+            except RuntimeError:
+                pass
+
+        except Exception as e:
+            context["error"] = str(e)
+
+        return context
+
     @staticmethod
     def get_caller_info(skip: int = 2) -> Dict[str, Any]:
         """
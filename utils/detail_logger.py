@@ -8,10 +8,11 @@
 import json
 import os
 import time
-import asyncio
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from utils.async_monitor import AsyncMonitor
+
 
 class DetailLogger:
     """
@@ -22,21 +23,10 @@ class DetailLogger:
     - ARCH: 架构还原（在 DETAIL 基础上添加异步框架活动信息）
 
     输出格式：JSON Lines (.jsonl)，每行一个JSON对象
+    使用模块级实例 detail_logger，不要重复创建
     """
 
-    _instance = None
-
-    def __new__(cls, *args, **kwargs):
-        """单例模式确保只有一个DetailLogger实例"""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-
     def __init__(self, log_dir: str = "logs"):
-        if self._initialized:
-            return
-
         self.log_dir = Path(log_dir)
         self.detail_dir = self.log_dir / "detail"
         self.arch_dir = self.log_dir / "arch"
@@ -53,8 +43,6 @@ class DetailLogger:
         self._detail_fh = None
         self._arch_fh = None
 
-        self._initialized = True
-
     def _get_detail_fh(self):
         """获取 detail 日志文件句柄（延迟打开）"""
         if self._detail_fh is None:
@@ -71,68 +59,6 @@ class DetailLogger:
         """获取微秒级时间戳"""
         return time.time_ns() // 1000
 
-    def _collect_async_context(self) -> Dict[str, Any]:
-        """
-        收集异步框架上下文信息
-
-        包括：
-        - 当前 Task 信息
-        - 所有活跃 Task 列表
-        - 事件循环状态
-        """
-        context = {
-            "current_task": None,
-            "all_tasks": [],
-            "event_loop": None
-        }
-
-        try:
-            # 获取当前任务
-            try:
-                current_task = asyncio.current_task()
-                if current_task:
-                    coro = current_task.get_coro()
-                    context["current_task"] = {
-                        "task_id": id(current_task),
-                        "task_name": current_task.get_name(),
-                        "coro_name": getattr(coro, '__qualname__', str(coro)),
-                        "stack_depth": len(current_task.get_stack()) if hasattr(current_task, 'get_stack') else 0
-                    }
-            except RuntimeError:
-                # 当前没有正在运行的任务
-                pass
-
-            # 获取所有任务
-            try:
-                all_tasks = asyncio.all_tasks()
-                context["all_tasks"] = [
-                    {
-                        "task_id": id(t),
-                        "task_name": t.get_name(),
-                        "coro_name": getattr(t.get_coro(), '__qualname__', str(t.get_coro()))
-                    }
-                    for t in all_tasks
-                ]
-            except RuntimeError:
-                pass
-
-            # 获取事件循环信息
-            try:
-                loop = asyncio.get_event_loop()
-                context["event_loop"] = {
-                    "loop_id": id(loop),
-                    "is_running": loop.is_running(),
-                    "is_closed": loop.is_closed(),
-                    "default_executor": loop._default_executor is not None if hasattr(loop, '_default_executor') else None
-                }
-            except RuntimeError:
-                pass
-
-        except Exception as e:
-            context["error"] = str(e)
-
-        return context
-
     def log_detail(self, source: str, event_type: str, data: Dict[str, Any],
                    object_refs: Optional[Dict[str, Any]] = None):
         """
@@ -202,7 +128,7 @@ class DetailLogger:
             "event_type": event_type,
             "data": data,
             "object_refs": object_refs or {},
-            "async_context": self._collect_async_context()
+            "async_context": AsyncMonitor.collect_log_context()
         }
 
         try:
@@ -4,12 +4,19 @@
 计算Agent的激活频率，包括瞬时频率和基于时间的移动平均
 """
 
+import logging
 import time
 from collections import deque
 from typing import Optional, List
 from utils.logger import LoggerFactory
 
 
+_NS_PER_SECOND = 1_000_000_000
+
+# 时间窗口内可追踪的最高激活频率（Hz），用于限定激活记录队列的长度
+_MAX_TRACKED_FREQUENCY_HZ = 100
+
+
 class ActivationFrequencyCalculator:
     """
     激活频率计算器
@@ -20,6 +27,20 @@ class ActivationFrequencyCalculator:
     - 记录激活历史
     """
     
+    # 每个Agent及其每个关键字都持有一个实例，使用 __slots__ 省去实例 __dict__
+    __slots__ = (
+        'window_size',
+        'time_window_seconds',
+        'agent_id',
+        '_time_window_ns',
+        '_str_prefix',
+        'activation_times',
+        'instant_frequency',
+        'moving_average_frequency',
+        'total_activations',
+        'logger',
+    )
+    
     def __init__(self, 
                  window_size: int = 10, 
                  time_window_seconds: float = 60.0,
@@ -35,9 +56,14 @@ class ActivationFrequencyCalculator:
         self.window_size = window_size
         self.time_window_seconds = time_window_seconds
         self.agent_id = agent_id
+        self._time_window_ns = int(time_window_seconds * _NS_PER_SECOND)
+        self._str_prefix = f"ActivationFrequencyCalculator(agent={agent_id}, "
         
-        # 激活时间记录
-        self.activation_times: deque = deque()
+        # 激活时间记录（perf_counter_ns 整数纳秒，不受系统时间调整影响）
+        # 队列长度有上限，突发激活时由 append 自动淘汰最旧记录，内存始终有界
+        self.activation_times: deque = deque(
+            maxlen=max(window_size, int(time_window_seconds * _MAX_TRACKED_FREQUENCY_HZ))
+        )
         
         # 频率统计
         self.instant_frequency: float = 0.0  # 瞬时频率（Hz）
@@ -49,76 +75,55 @@ class ActivationFrequencyCalculator:
             f"frequency_calculator"
         )
         
-        self.logger.debug(
-            f"激活频率计算器已创建 - 窗口大小: {window_size}, "
-            f"时间窗口: {time_window_seconds}秒"
-        )
+        if self.logger.is_enabled_for(logging.DEBUG):
+            self.logger.debug(
+                f"激活频率计算器已创建 - 窗口大小: {window_size}, "
+                f"时间窗口: {time_window_seconds}秒"
+            )
     
     def record_activation(self) -> None:
         """
         记录一次激活事件并重新计算频率
+
+        每次激活只读取一次时钟，同一时间戳用于入队与过期清理
         """
-        current_time = time.time()
+        current_time = time.perf_counter_ns()
         self.activation_times.append(current_time)
         self.total_activations += 1
         
-        # 清理过期的时间记录
-        self._clean_old_activations(current_time)
-        
-        # 计算频率
-        self._calculate_instant_frequency()
-        self._calculate_moving_average_frequency()
+        # 一次完成过期清理与频率计算
+        self._prune_and_recalc(current_time)
         
         # 减少日志记录，只在调试模式下记录详细频率信息
     
-    def _clean_old_activations(self, current_time: float) -> None:
+    def _prune_and_recalc(self, current_time: int) -> None:
         """
-        清理超出时间窗口的激活记录
+        清理超出时间窗口的激活记录，并据此更新瞬时频率和移动平均频率
+        
+        清理后队列中只剩窗口内的记录，队列长度即为窗口内的激活次数
         """
-        cutoff_time = current_time - self.time_window_seconds
+        activation_times = self.activation_times
+        cutoff_time = current_time - self._time_window_ns
         
         # 移除超出时间窗口的记录
-        while (self.activation_times and 
-               self.activation_times[0] < cutoff_time):
-            self.activation_times.popleft()
-    
-    def _calculate_instant_frequency(self) -> None:
-        """
-        计算瞬时频率（基于最近两次激活的时间间隔）
-        """
-        if len(self.activation_times) < 2:
-            # 如果激活次数不足，无法计算瞬时频率
+        while activation_times and activation_times[0] < cutoff_time:
+            activation_times.popleft()
+        
+        activations_in_window = len(activation_times)
+        if activations_in_window < 2:
+            # 如果激活次数不足，无法计算频率
             self.instant_frequency = 0.0
+            self.moving_average_frequency = 0.0
             return
         
-        # 计算最近两次激活的时间间隔
-        recent_times = list(self.activation_times)[-2:]
-        time_interval = recent_times[1] - recent_times[0]
-        
+        # 瞬时频率：最近两次激活的时间间隔（纳秒，直接索引队尾）
+        time_interval = activation_times[-1] - activation_times[-2]
         if time_interval > 0:
-            self.instant_frequency = 1.0 / time_interval
+            self.instant_frequency = _NS_PER_SECOND / time_interval
         else:
             self.instant_frequency = float('inf')
-    
-    def _calculate_moving_average_frequency(self) -> None:
-        """
-        计算基于时间的移动平均频率
-        """
-        if len(self.activation_times) < 2:
-            # 如果激活次数不足，无法计算移动平均
-            self.moving_average_frequency = 0.0
-            return
-        
-        # 计算时间窗口内的激活次数
-        current_time = time.time()
-        window_start = current_time - self.time_window_seconds
-        
-        # 统计时间窗口内的激活次数
-        activations_in_window = sum(
-            1 for t in self.activation_times 
-            if t >= window_start
-        )
         
+        # 移动平均频率：时间窗口内的激活次数 / 窗口长度
         if self.time_window_seconds > 0:
             self.moving_average_frequency = activations_in_window / self.time_window_seconds
         else:
@@ -164,7 +169,7 @@ class ActivationFrequencyCalculator:
     def __str__(self) -> str:
         """字符串表示"""
         return (
-            f"ActivationFrequencyCalculator(agent={self.agent_id}, "
+            f"{self._str_prefix}"
             f"instant={self.instant_frequency:.3f} Hz, "
             f"moving_avg={self.moving_average_frequency:.3f} Hz, "
             f"total={self.total_activations})"
@@ -209,7 +214,8 @@ class FrequencyMonitor:
         )
         self.frequency_calculators[agent_id] = calculator
         
-        self.logger.debug(f"Agent {agent_id} 已注册频率计算器")
+        if self.logger.is_enabled_for(logging.DEBUG):
+            self.logger.debug(f"Agent {agent_id} 已注册频率计算器")
         return calculator
     
     def record_activation(self, agent_id: str) -> None:
@@ -264,7 +270,8 @@ class FrequencyMonitor:
         """
         if agent_id in self.frequency_calculators:
             del self.frequency_calculators[agent_id]
-            self.logger.debug(f"Agent {agent_id} 的频率计算器已注销")
+            if self.logger.is_enabled_for(logging.DEBUG):
+                self.logger.debug(f"Agent {agent_id} 的频率计算器已注销")
         else:
             self.logger.warning(f"尝试注销未注册的Agent: {agent_id}")
     
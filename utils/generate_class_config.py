@@ -8,8 +8,39 @@ import json
 import glob
 import yaml
 import importlib
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# 优先使用 libyaml 的 C 解析器，不可用时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+def _load_system_agent(yaml_file):
+    """读取并解析单个SystemAgent配置，返回(agent_id, class_name)"""
+    with open(yaml_file, 'r', encoding='utf-8') as f:
+        agent_data = yaml.load(f, Loader=_YamlLoader)
+    
+    agent_id = agent_data.get("id")
+    
+    # 获取类名，支持metadata中的class_name
+    class_name = None
+    if "metadata" in agent_data and "class_name" in agent_data["metadata"]:
+        class_name = agent_data["metadata"]["class_name"]
+    elif "class_name" in agent_data:
+        class_name = agent_data["class_name"]
+    
+    return agent_id, class_name
+
+def _try_load_system_agent(yaml_file):
+    """在线程池中执行的包装，异常作为结果返回，以便在主线程按顺序输出"""
+    try:
+        return _load_system_agent(yaml_file), None
+    except Exception as e:
+        return None, e
+
 def scan_system_agents():
     """扫描SystemAgents文件夹，获取Agent ID和类名的映射"""
     system_agents_dir = "Agents/SystemAgents"
@@ -18,54 +49,56 @@ def scan_system_agents():
     # 扫描所有yaml文件
     yaml_files = glob.glob(f"{system_agents_dir}/*.yaml")
     
-    for yaml_file in yaml_files:
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                agent_data = yaml.safe_load(f)
-            
-            agent_id = agent_data.get("id")
-            
-            # 获取类名，支持metadata中的class_name
-            class_name = None
-            if "metadata" in agent_data and "class_name" in agent_data["metadata"]:
-                class_name = agent_data["metadata"]["class_name"]
-            elif "class_name" in agent_data:
-                class_name = agent_data["class_name"]
-            
-            if agent_id and class_name:
-                agent_mapping[agent_id] = class_name
-                print(f"✅ 找到Agent: {agent_id} -> {class_name}")
-            else:
-                print(f"⚠️ 文件 {yaml_file} 缺少id或class_name")
-                
-        except Exception as e:
-            print(f"❌ 解析文件 {yaml_file} 失败: {e}")
+    # 并发读取和解析（map保持文件顺序）
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_try_load_system_agent, yaml_files))
+    
+    for yaml_file, (loaded, error) in zip(yaml_files, results):
+        if error is not None:
+            print(f"❌ 解析文件 {yaml_file} 失败: {error}")
+            continue
+        
+        agent_id, class_name = loaded
+        if agent_id and class_name:
+            agent_mapping[agent_id] = class_name
+            print(f"✅ 找到Agent: {agent_id} -> {class_name}")
+        else:
+            print(f"⚠️ 文件 {yaml_file} 缺少id或class_name")
     
     return agent_mapping
 
-def find_class_module(class_name):
-    """在system_interface_agents文件夹中查找类所在的模块"""
+def build_class_index():
+    """扫描system_interface_agents文件夹一次，建立类名到模块名的索引"""
     interface_dir = "system_interface_agents"
     python_files = glob.glob(f"{interface_dir}/*.py")
+    class_index = {}
     
     for py_file in python_files:
         # 提取模块名（不含路径和扩展名）
         module_name = Path(py_file).stem
         
         try:
-            # 尝试导入模块
+            # 每个模块只导入一次
             module = importlib.import_module(f"{interface_dir}.{module_name}")
-            
-            # 检查模块中是否有目标类
-            if hasattr(module, class_name):
-                print(f"✅ 找到类 {class_name} 在模块 {module_name}")
-                return module_name
-                
         except ImportError as e:
             print(f"⚠️ 导入模块 {module_name} 失败: {e}")
             continue
+        
+        # 记录模块中的所有类（先出现的模块优先，与逐个查找的顺序一致）
+        for name, _ in inspect.getmembers(module, inspect.isclass):
+            class_index.setdefault(name, module_name)
+    
+    return class_index
+
+def find_class_module(class_name, class_index=None):
+    """在system_interface_agents文件夹中查找类所在的模块"""
+    if class_index is None:
+        class_index = build_class_index()
     
-    return None
+    module_name = class_index.get(class_name)
+    if module_name:
+        print(f"✅ 找到类 {class_name} 在模块 {module_name}")
+    return module_name
 
 def generate_class_config():
     """生成class_config.json文件"""
@@ -77,10 +110,11 @@ def generate_class_config():
         return False
     
     print(f"\n🔍 开始查找类文件...")
+    class_index = build_class_index()
     class_config = {}
     
     for agent_id, class_name in agent_mapping.items():
-        module_name = find_class_module(class_name)
+        module_name = find_class_module(class_name, class_index)
         if module_name:
             # 生成完整类路径: "module_name.ClassName"
             class_config[agent_id] = f"{module_name}.{class_name}"
@@ -10,6 +10,40 @@ import time
 from datetime import datetime
 from typing import Dict, Any
 
+from utils.log_writer import BackgroundLogWriter
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+if orjson is not None:
+    _dumps = orjson.dumps
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+# 批量写入阈值
+_FLUSH_BYTES = 64 * 1024
+_FLUSH_INTERVAL = 0.2
+
+# (秒级时间戳, 格式化字符串) 缓存，同一秒内的日志复用同一个字符串
+_ts_cache = (0, "")
+
+
+def _now_str() -> str:
+    """返回当前时间的 "%Y-%m-%d %H:%M:%S" 字符串，每秒只格式化一次"""
+    global _ts_cache
+    second = int(time.time())
+    cached_second, cached_str = _ts_cache
+    if cached_second == second:
+        return cached_str
+    formatted = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+    _ts_cache = (second, formatted)
+    return formatted
+
 
 class LLMLogger:
     """
@@ -33,6 +67,21 @@ class LLMLogger:
         self.log_dir = log_dir
         os.makedirs(log_dir, exist_ok=True)
         self.log_file = os.path.join(log_dir, "llm_calls.jsonl")
+
+        # 后台线程批量写入：缓冲满 64 KiB 或 0.2 秒未写入时落盘，进程退出时写完剩余记录
+        self._writer = BackgroundLogWriter(
+            self.log_file, "ab",
+            flush_bytes=_FLUSH_BYTES,
+            flush_interval=_FLUSH_INTERVAL
+        )
+
+    def _write_entry(self, log_entry: Dict[str, Any]):
+        """写入一条 JSONL 记录"""
+        self._writer.write(_dumps(log_entry) + b"\n")
+
+    def close(self):
+        """写完剩余记录并关闭日志文件"""
+        self._writer.close()
         
     def log_llm_call(
         self, 
@@ -57,7 +106,7 @@ class LLMLogger:
             tokens_used: 使用的token数量
         """
         log_entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": _now_str(),
             "agent_id": agent_id,
             "model": model,
             "input": {
@@ -70,8 +119,7 @@ class LLMLogger:
         }
         
         # 写入JSONL格式文件
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        self._write_entry(log_entry)
     
     def log_input_agent_message(self, agent_id: str, message: str, receiver_ids: list):
         """
@@ -83,15 +131,14 @@ class LLMLogger:
             receiver_ids: 接收者ID列表
         """
         log_entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": _now_str(),
             "type": "input_agent_message",
             "agent_id": agent_id,
             "message": message,
             "receivers": receiver_ids
         }
         
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        self._write_entry(log_entry)
     
     def log_output_agent_message(self, agent_id: str, message: str, sender_id: str):
         """
@@ -103,15 +150,14 @@ class LLMLogger:
             sender_id: 发送者ID
         """
         log_entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": _now_str(),
             "type": "output_agent_message", 
             "agent_id": agent_id,
             "message": message,
             "sender": sender_id
         }
         
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        self._write_entry(log_entry)
 
 
 # 全局LLM日志记录器实例
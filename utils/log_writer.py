@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+后台日志写入器
+调用方只把格式化好的日志行放入有界队列，由独立的守护线程批量写入文件，
+磁盘 I/O 不再阻塞事件循环和 LLM 调用路径
+"""
+
+import atexit
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+
+class BackgroundLogWriter:
+    """
+    后台日志写入器 - 每个日志文件一个实例
+
+    - 文件在创建时打开一次，之后只由写入线程访问
+    - 写入线程每次取出队列中积压的全部日志行，合并为一次 write
+    - 可选批量阈值：缓冲达到 flush_bytes 或距上次写入超过 flush_interval 秒才写入，
+      默认（0）每取出一批就写入
+    - 队列有界，写入跟不上时调用方阻塞等待，而不是无限占用内存
+    - 进程退出时（atexit）写完剩余日志并关闭文件；关闭标记的检查与入队在同一把锁下完成，
+      已入队的日志一定排在结束标记之前并被写入
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: Union[str, Path], mode: str = 'a', maxsize: int = 8192,
+                 flush_bytes: int = 0, flush_interval: float = 0.0):
+        """
+        Args:
+            path: 日志文件路径
+            mode: 打开模式，'a' 写入 str，'ab' 写入 bytes
+            maxsize: 队列最大长度
+            flush_bytes: 缓冲达到该长度时写入
+            flush_interval: 缓冲非空时最长等待秒数
+        """
+        self.path = Path(path)
+        self._flush_bytes = flush_bytes
+        self._flush_interval = flush_interval
+        if 'b' in mode:
+            self._fh = open(self.path, mode)
+            self._join = b"".join
+        else:
+            self._fh = open(self.path, mode, encoding='utf-8')
+            self._join = "".join
+
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"log-writer:{self.path.name}",
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line: Union[str, bytes]):
+        """放入一行日志（需自带换行符）"""
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put(line)
+
+    def _run(self):
+        """写入线程主循环"""
+        q = self._queue
+        buf = []
+        buf_size = 0
+        last_write = time.monotonic()
+
+        while True:
+            # 缓冲非空时最多等到时间阈值，否则一直阻塞等待新日志
+            timeout = None
+            if buf:
+                timeout = max(0.0, self._flush_interval - (time.monotonic() - last_write))
+            try:
+                item = q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            # 取出当前积压的全部日志行
+            stop = False
+            while item is not None:
+                if item is self._STOP:
+                    stop = True
+                    break
+                buf.append(item)
+                buf_size += len(item)
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if buf and (stop
+                        or buf_size >= self._flush_bytes
+                        or time.monotonic() - last_write >= self._flush_interval):
+                try:
+                    self._fh.write(self._join(buf))
+                    self._fh.flush()
+                except Exception as e:
+                    # 日志失败不应该影响主程序
+                    print(f"BackgroundLogWriter write error ({self.path}): {e}")
+                buf.clear()
+                buf_size = 0
+                last_write = time.monotonic()
+
+            if stop:
+                break
+
+        self._fh.close()
+
+    def close(self):
+        """写完队列中剩余的日志并关闭文件"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join()
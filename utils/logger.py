@@ -1,9 +1,13 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 import time
 from enum import Enum, auto
 from typing import Dict, Optional, Any
-from utils.detail_logger import DetailLogger
+from utils.detail_logger import DetailLogger, detail_logger
 
 
 class LogMode(Enum):
@@ -18,19 +22,61 @@ class LogMode(Enum):
     ARCH = auto()
 
 
+class _RoutingHandler(logging.Handler):
+    """按 logger 名称把日志记录分发到对应文件 handler（运行在队列监听线程中）"""
+
+    def __init__(self, handlers: Dict[str, logging.Handler]):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record: logging.LogRecord):
+        handler = self.handlers.get(record.name)
+        if handler is not None:
+            handler.handle(record)
+
+
 class LoggerFactory:
-    """日志工厂类，为每个类名创建独立的日志文件"""
+    """日志工厂类，为每个类名创建独立的日志文件
+
+    所有 logger 共用一个 QueueHandler，调用方只负责入队；
+    文件写入由 QueueListener 后台线程按 logger 名称分发到各自的 FileHandler。
+    """
     _loggers: Dict[str, 'StructuredLogger'] = {}
     _handlers: Dict[str, logging.Handler] = {}
+    _queue_handler: Optional[logging.handlers.QueueHandler] = None
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _listener_lock = threading.Lock()  # 保证多线程并发创建 logger 时只启动一个后台线程
     _global_mode: LogMode = LogMode.CONTENT
+    _level: int = logging.DEBUG  # 所有 logger 的日志级别，低于该级别的日志在格式化前即被跳过
     _class_modes: Dict[str, LogMode] = {}
     _detail_logger: Optional[DetailLogger] = None
 
     @classmethod
     def _init_detail_logger(cls):
-        """初始化结构化日志记录器（延迟初始化）"""
+        """初始化结构化日志记录器（使用模块级 detail_logger 实例）"""
         if cls._detail_logger is None:
-            cls._detail_logger = DetailLogger()
+            cls._detail_logger = detail_logger
+
+    @classmethod
+    def _init_queue_listener(cls):
+        """初始化后台写入线程（延迟初始化）"""
+        with cls._listener_lock:
+            if cls._listener is None:
+                log_queue: queue.Queue = queue.Queue(-1)
+                cls._queue_handler = logging.handlers.QueueHandler(log_queue)
+                cls._listener = logging.handlers.QueueListener(log_queue, _RoutingHandler(cls._handlers))
+                cls._listener.start()
+                atexit.register(cls._stop_queue_listener)
+
+    @classmethod
+    def _stop_queue_listener(cls):
+        """写完队列中剩余的日志并停止后台线程"""
+        with cls._listener_lock:
+            if cls._listener is not None:
+                cls._listener.stop()
+                cls._listener = None
+                for handler in cls._handlers.values():
+                    handler.close()
 
     @classmethod
     def set_mode(cls, mode: LogMode):
@@ -44,6 +90,23 @@ class LoggerFactory:
         for logger in cls._loggers.values():
             logger.set_mode(mode)
 
+    @classmethod
+    def set_level(cls, level: int):
+        """设置全局日志级别
+
+        Args:
+            level: 日志级别 (logging.DEBUG / INFO / WARNING ...)
+        """
+        cls._level = level
+        # 更新所有已创建的logger的级别
+        for logger in cls._loggers.values():
+            logger.raw_logger.setLevel(level)
+
+    @classmethod
+    def get_level(cls) -> int:
+        """获取当前全局日志级别"""
+        return cls._level
+
     @classmethod
     def set_mode_for_class(cls, class_name: str, mode: LogMode):
         """为特定类设置日志模式
@@ -89,7 +152,7 @@ class LoggerFactory:
 
         # 创建底层 logging.Logger
         raw_logger = logging.getLogger(f"avm2.{class_name}")
-        raw_logger.setLevel(logging.DEBUG)
+        raw_logger.setLevel(cls._level)
 
         # 避免重复添加 handler
         if not raw_logger.handlers:
@@ -105,8 +168,10 @@ class LoggerFactory:
             )
             file_handler.setFormatter(formatter)
 
-            # 添加 handler 到 logger
-            raw_logger.addHandler(file_handler)
+            # 文件 handler 由后台线程调用，logger 上只挂共享的 QueueHandler
+            cls._init_queue_listener()
+            cls._handlers[raw_logger.name] = file_handler
+            raw_logger.addHandler(cls._queue_handler)
             raw_logger.propagate = False  # 避免日志传播到 root logger
 
         # 确定该logger的模式
@@ -141,6 +206,8 @@ class StructuredLogger:
         self.detail_logger = detail_logger
         self._mode = mode
         self._agent_id: Optional[str] = None  # 如果设置了Agent ID
+        self._prefix = ""
+        self._prefix_fmt = ""
 
     def set_mode(self, mode: LogMode):
         """设置当前logger的模式"""
@@ -153,38 +220,58 @@ class StructuredLogger:
     def set_agent_id(self, agent_id: str):
         """设置Agent ID（用于Agent日志）"""
         self._agent_id = agent_id
+        self._prefix = f"[Agent:{agent_id}] " if agent_id else ""
+        self._prefix_fmt = self._prefix.replace("%", "%%")
+
+    def is_enabled_for(self, level: int) -> bool:
+        """检查指定级别（logging.DEBUG 等）是否会被记录，用于跳过昂贵的消息格式化"""
+        return self.raw_logger.isEnabledFor(level)
 
     # ========== CONTENT 模式方法（标准日志） ==========
+    # 与标准 logging 相同，msg 可带 %s 占位符，args 在确实写入时才格式化；
+    # stacklevel=2 让 funcName/lineno 指向调用方而不是本包装方法
 
-    def debug(self, msg: str):
+    def _with_prefix(self, msg: str, args: tuple) -> str:
+        """在消息前加上 Agent 前缀（有 args 时前缀中的 % 需转义）"""
+        if not self._agent_id:
+            return msg
+        return (self._prefix_fmt if args else self._prefix) + msg
+
+    def debug(self, msg: str, *args):
         """记录DEBUG级别日志（运行内容模式）"""
-        prefix = f"[Agent:{self._agent_id}] " if self._agent_id else ""
-        self.raw_logger.debug(f"{prefix}{msg}")
+        if not self.raw_logger.isEnabledFor(logging.DEBUG):
+            return
+        self.raw_logger.debug(self._with_prefix(msg, args), *args, stacklevel=2)
 
-    def info(self, msg: str):
+    def info(self, msg: str, *args):
         """记录INFO级别日志（运行内容模式）"""
-        prefix = f"[Agent:{self._agent_id}] " if self._agent_id else ""
-        self.raw_logger.info(f"{prefix}{msg}")
+        if not self.raw_logger.isEnabledFor(logging.INFO):
+            return
+        self.raw_logger.info(self._with_prefix(msg, args), *args, stacklevel=2)
 
-    def warning(self, msg: str):
+    def warning(self, msg: str, *args):
         """记录WARNING级别日志（运行内容模式）"""
-        prefix = f"[Agent:{self._agent_id}] " if self._agent_id else ""
-        self.raw_logger.warning(f"{prefix}{msg}")
+        if not self.raw_logger.isEnabledFor(logging.WARNING):
+            return
+        self.raw_logger.warning(self._with_prefix(msg, args), *args, stacklevel=2)
 
-    def error(self, msg: str):
+    def error(self, msg: str, *args):
         """记录ERROR级别日志（运行内容模式）"""
-        prefix = f"[Agent:{self._agent_id}] " if self._agent_id else ""
-        self.raw_logger.error(f"{prefix}{msg}")
+        if not self.raw_logger.isEnabledFor(logging.ERROR):
+            return
+        self.raw_logger.error(self._with_prefix(msg, args), *args, stacklevel=2)
 
-    def exception(self, msg: str):
+    def exception(self, msg: str, *args):
         """记录EXCEPTION级别日志（运行内容模式）"""
-        prefix = f"[Agent:{self._agent_id}] " if self._agent_id else ""
-        self.raw_logger.exception(f"{prefix}{msg}")
+        if not self.raw_logger.isEnabledFor(logging.ERROR):
+            return
+        self.raw_logger.exception(self._with_prefix(msg, args), *args, stacklevel=2)
 
-    def critical(self, msg: str):
+    def critical(self, msg: str, *args):
         """记录CRITICAL级别日志（运行内容模式）"""
-        prefix = f"[Agent:{self._agent_id}] " if self._agent_id else ""
-        self.raw_logger.critical(f"{prefix}{msg}")
+        if not self.raw_logger.isEnabledFor(logging.CRITICAL):
+            return
+        self.raw_logger.critical(self._with_prefix(msg, args), *args, stacklevel=2)
 
     # ========== DETAIL 模式方法（程序细节） ==========
 
@@ -237,9 +324,6 @@ class AgentLogger:
         # 设置Agent ID以便logger使用
         logger.set_agent_id(str(agent_id))
 
-    def _get_prefix(self) -> str:
-        return f"[Agent:{self.agent_id}] "
-
     def debug(self, msg: str):
         self.raw_logger.debug(msg)
 
@@ -297,6 +381,18 @@ def _init_log_mode_from_env():
         basic_logger.info(f"日志模式设置为: {mode_str}")
 
 
+# 从环境变量读取日志级别
+def _init_log_level_from_env():
+    """根据环境变量 AVM2_LOG_LEVEL 初始化日志级别（DEBUG / INFO / WARNING / ERROR / CRITICAL，默认 DEBUG）"""
+    level_str = os.environ.get('AVM2_LOG_LEVEL', 'DEBUG').upper()
+    level = logging.getLevelName(level_str)
+    if isinstance(level, int):
+        LoggerFactory.set_level(level)
+
+
+# 先确定日志级别，之后创建的 logger 直接使用该级别
+_init_log_level_from_env()
+
 # 初始化基本logger
 basic_logger = LoggerFactory.get_logger("basic")
 
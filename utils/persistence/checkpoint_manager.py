@@ -3,10 +3,15 @@
 负责保存和加载AgentSystem的完整状态
 """
 
+import gzip
+import hashlib
 import json
+import mmap
+import threading
 import pickle
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
@@ -15,6 +20,109 @@ from driver.agent import Agent
 from driver.i_o_agent import InputAgent, OutputAgent
 from utils.logger import LoggerFactory
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+if orjson is not None:
+    def _dumps(obj: Any, indent: bool = True) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any, indent: bool = True) -> bytes:
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    _loads = json.loads
+
+
+# 检查点文件后缀：可读 JSON 与压缩 JSON
+_JSON_SUFFIX = ".json"
+_GZIP_SUFFIX = ".json.gz"
+
+# 元数据旁路文件：list_checkpoints 只读这个小文件，不解析检查点主体。
+# 旁路文件放在单独的子目录中，按检查点的完整文件名命名（x.json 与 x.json.gz 各有一个），
+# 不会与用户命名的检查点混淆
+_META_DIR = "meta"
+_META_SUFFIX = ".meta.json"
+
+# 增量检查点的 Agent 数据块目录（按内容哈希命名，多个检查点共享）
+_BLOB_DIR = "agents"
+
+# 数据块压缩/写入线程数：zlib 压缩与文件写入都会释放 GIL，可与主线程的编码重叠
+_BLOB_IO_WORKERS = 2
+
+# 压缩级别：检查点写入受磁盘带宽限制，低级别即可去掉大部分冗余且开销最小
+_GZIP_LEVEL = 1
+
+
+def _checkpoint_name(checkpoint_path: Path) -> Optional[str]:
+    """检查点名称（去掉后缀）；不是检查点文件时返回 None"""
+    name = checkpoint_path.name
+    if name.endswith(_GZIP_SUFFIX):
+        return name[:-len(_GZIP_SUFFIX)]
+    if name.endswith(_JSON_SUFFIX):
+        return name[:-len(_JSON_SUFFIX)]
+    return None
+
+
+def _meta_path(checkpoint_path: Path) -> Path:
+    """检查点文件对应的元数据旁路文件路径（<检查点目录>/meta/<检查点文件名>.meta.json）"""
+    return checkpoint_path.parent / _META_DIR / (checkpoint_path.name + _META_SUFFIX)
+
+
+def _write_meta(meta_file: Path, meta: Dict[str, Any]):
+    """写入元数据旁路文件（旁路文件目录不存在时创建）"""
+    meta_file.parent.mkdir(exist_ok=True)
+    with open(meta_file, 'wb') as f:
+        f.write(_dumps(meta))
+
+
+def _open_checkpoint(checkpoint_path: Path, mode: str):
+    """按后缀打开检查点文件（.json.gz 透明解压/压缩）"""
+    if checkpoint_path.name.endswith(_GZIP_SUFFIX):
+        return gzip.open(checkpoint_path, mode, compresslevel=_GZIP_LEVEL)
+    return open(checkpoint_path, mode)
+
+
+def _write_blob(blob_path: Path, blob: bytes, compress: bool):
+    """压缩（可选）并写入一个数据块（在后台线程中执行）"""
+    if compress:
+        blob = gzip.compress(blob, compresslevel=_GZIP_LEVEL)
+    # 先写临时文件再改名，中断时不会留下同名的残缺数据块
+    tmp_path = blob_path.with_name(blob_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp_path, blob_path)
+
+
+def _read_checkpoint(checkpoint_path: Path) -> Any:
+    """
+    读取并解析检查点文件
+
+    未压缩文件且可用 orjson 时，通过 mmap 直接解析页缓存中的数据，
+    不再把整个文件复制成一份 bytes
+    """
+    if orjson is not None and not checkpoint_path.name.endswith(_GZIP_SUFFIX):
+        with open(checkpoint_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # 空文件无法映射，交给解析器报错
+                return _loads(b"")
+            try:
+                with memoryview(mm) as view:
+                    return _loads(view)
+            finally:
+                mm.close()
+
+    with _open_checkpoint(checkpoint_path, 'rb') as f:
+        return _loads(f.read())
+
 
 class CheckpointManager:
     """
@@ -22,26 +130,37 @@ class CheckpointManager:
     管理AgentSystem的持久化检查点
     """
     
-    def __init__(self, checkpoint_dir: str = "checkpoints"):
+    def __init__(self, checkpoint_dir: str = "checkpoints", compress: bool = False):
         """
         初始化检查点管理器
         
         Args:
             checkpoint_dir: 检查点保存目录
+            compress: 是否以压缩格式（.json.gz，紧凑 JSON）保存检查点；
+                      加载时按后缀自动识别，两种格式可以放在同一目录中（包括同名）
         """
         self.checkpoint_dir = Path(checkpoint_dir)
+        self.compress = compress
+        self.blob_dir = self.checkpoint_dir / _BLOB_DIR
+        self._known_blobs: set = set()  # 已确认存在的数据块文件名，避免重复写入和 stat
+        self._blob_executor: Optional[ThreadPoolExecutor] = None  # 数据块压缩/写入线程池（延迟创建）
+        # 保存与数据块清理互斥：新写入的数据块在检查点写完之前还没有被任何检查点引用
+        self._blob_lock = threading.Lock()
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
         self.logger = LoggerFactory.get_logger("CheckpointManager")
         
         self.logger.info(f"检查点管理器已初始化，检查点目录: {self.checkpoint_dir.absolute()}")
     
-    def save_checkpoint(self, system: AgentSystem, checkpoint_name: Optional[str] = None) -> str:
+    def save_checkpoint(self, system: AgentSystem, checkpoint_name: Optional[str] = None,
+                        incremental: bool = False) -> str:
         """
         保存系统检查点
         
         Args:
             system: 要保存的AgentSystem实例
             checkpoint_name: 检查点名称，如果为None则自动生成
+            incremental: 是否保存为增量检查点——每个Agent的数据按内容哈希存入共享数据块目录，
+                         检查点本身只记录引用；未变化的Agent不重复写入
             
         Returns:
             保存的检查点文件路径
@@ -50,20 +169,29 @@ class CheckpointManager:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             checkpoint_name = f"checkpoint_{timestamp}"
         
-        checkpoint_file = self.checkpoint_dir / f"{checkpoint_name}.json"
+        suffix = _GZIP_SUFFIX if self.compress else _JSON_SUFFIX
+        checkpoint_file = self.checkpoint_dir / f"{checkpoint_name}{suffix}"
         
         self.logger.info(f"开始保存检查点: {checkpoint_file}")
         
         try:
             # 构建检查点数据
             checkpoint_data = self._build_checkpoint_data(system)
-            
-            # 保存为JSON文件
-            with open(checkpoint_file, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint_data, f, ensure_ascii=False, indent=2)
+            with self._blob_lock:
+                if incremental:
+                    checkpoint_data['agent_refs'] = self._store_agent_blobs(checkpoint_data['agents'])
+                    checkpoint_data['agents'] = {}
+                
+                # 保存为JSON文件：未压缩时保持缩进可读，压缩时使用紧凑格式流式写入
+                with _open_checkpoint(checkpoint_file, 'wb') as f:
+                    f.write(_dumps(checkpoint_data, indent=not self.compress))
+
+                # 主体写完后再写元数据旁路文件，旁路文件存在即表示检查点完整
+                meta = self._build_meta(checkpoint_data)
+                _write_meta(_meta_path(checkpoint_file), meta)
             
             self.logger.info(f"检查点保存成功: {checkpoint_file}")
-            self.logger.info(f"保存了 {len(checkpoint_data['agents'])} 个Agent的状态")
+            self.logger.info(f"保存了 {meta['agent_count']} 个Agent的状态")
             
             return str(checkpoint_file)
             
@@ -90,8 +218,11 @@ class CheckpointManager:
         
         try:
             # 加载检查点数据
-            with open(checkpoint_path, 'r', encoding='utf-8') as f:
-                checkpoint_data = json.load(f)
+            checkpoint_data = _read_checkpoint(checkpoint_path)
+            
+            # 增量检查点：从数据块目录取回Agent数据
+            if 'agent_refs' in checkpoint_data:
+                checkpoint_data['agents'] = self._load_agent_blobs(checkpoint_data['agent_refs'])
             
             # 重建系统
             system = self._rebuild_system(checkpoint_data)
@@ -114,17 +245,19 @@ class CheckpointManager:
         """
         checkpoints = []
         
-        for checkpoint_file in self.checkpoint_dir.glob("*.json"):
+        for checkpoint_file in self.checkpoint_dir.iterdir():
+            name = _checkpoint_name(checkpoint_file)
+            if name is None:
+                continue
             try:
-                with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                    checkpoint_data = json.load(f)
+                meta = self._read_meta(checkpoint_file)
                 
                 checkpoints.append({
                     'file': str(checkpoint_file),
-                    'name': checkpoint_file.stem,
-                    'timestamp': checkpoint_data.get('metadata', {}).get('timestamp', ''),
-                    'agent_count': len(checkpoint_data.get('agents', {})),
-                    'system_info': checkpoint_data.get('metadata', {}).get('system_info', {})
+                    'name': name,
+                    'timestamp': meta.get('timestamp', ''),
+                    'agent_count': meta.get('agent_count', 0),
+                    'system_info': meta.get('system_info', {})
                 })
             except Exception as e:
                 self.logger.warning(f"无法读取检查点文件 {checkpoint_file}: {e}")
@@ -134,6 +267,172 @@ class CheckpointManager:
         
         return checkpoints
     
+    def _read_meta(self, checkpoint_file: Path) -> Dict[str, Any]:
+        """
+        读取检查点元数据
+        
+        优先读取旁路文件；旧版本检查点没有旁路文件时解析一次完整文件，
+        并补写旁路文件，之后的列出操作只需读取小文件
+        
+        Args:
+            checkpoint_file: 检查点文件路径
+            
+        Returns:
+            元数据字典
+        """
+        meta_file = _meta_path(checkpoint_file)
+        try:
+            with open(meta_file, 'rb') as f:
+                return _loads(f.read())
+        except FileNotFoundError:
+            pass
+        
+        meta = self._build_meta(_read_checkpoint(checkpoint_file))
+        
+        try:
+            _write_meta(meta_file, meta)
+        except OSError as e:
+            self.logger.warning(f"无法写入检查点元数据文件 {meta_file}: {e}")
+        
+        return meta
+    
+    def _build_meta(self, checkpoint_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        提取检查点元数据（写入旁路文件，供 list_checkpoints 使用）
+        
+        Args:
+            checkpoint_data: 检查点数据
+            
+        Returns:
+            元数据字典
+        """
+        metadata = checkpoint_data.get('metadata', {})
+        agent_refs = checkpoint_data.get('agent_refs', {})
+        return {
+            'timestamp': metadata.get('timestamp', ''),
+            'agent_count': len(checkpoint_data.get('agents', {})) + len(agent_refs),
+            'system_info': metadata.get('system_info', {}),
+            'blobs': sorted(set(agent_refs.values()))  # 引用的数据块，供 cleanup_blobs 使用
+        }
+    
+    def _store_agent_blobs(self, agents: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """
+        将每个Agent的数据按内容哈希写入数据块目录
+        
+        内容未变化的Agent得到相同的数据块文件名，直接复用已有文件；
+        新数据块的压缩和写入交给后台线程池，主线程继续编码下一个Agent，
+        全部写完后才返回（检查点清单必须在数据块落盘之后写入）
+        
+        Args:
+            agents: agent_id -> 序列化的Agent数据
+            
+        Returns:
+            agent_id -> 数据块文件名
+        """
+        self.blob_dir.mkdir(exist_ok=True)
+        suffix = _GZIP_SUFFIX if self.compress else _JSON_SUFFIX
+        refs = {}
+        pending = {}  # 数据块文件名 -> Future
+        
+        if self._blob_executor is None:
+            self._blob_executor = ThreadPoolExecutor(
+                max_workers=_BLOB_IO_WORKERS, thread_name_prefix="checkpoint-blob"
+            )
+        
+        for agent_id, agent_data in agents.items():
+            blob = _dumps(agent_data, indent=False)
+            blob_name = hashlib.blake2b(blob, digest_size=16).hexdigest() + suffix
+            refs[agent_id] = blob_name
+            
+            if blob_name in self._known_blobs or blob_name in pending:
+                continue
+            blob_path = self.blob_dir / blob_name
+            if blob_path.exists():
+                self._known_blobs.add(blob_name)
+                continue
+            pending[blob_name] = self._blob_executor.submit(_write_blob, blob_path, blob, self.compress)
+        
+        # 等待全部数据块写完；任一失败则抛出，整个检查点保存失败
+        for blob_name, future in pending.items():
+            future.result()
+            self._known_blobs.add(blob_name)
+        
+        self.logger.info(f"增量保存: {len(refs)} 个Agent，新写入 {len(pending)} 个数据块")
+        return refs
+    
+    def _load_agent_blobs(self, refs: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        按引用从数据块目录读取Agent数据
+        
+        Args:
+            refs: agent_id -> 数据块文件名
+            
+        Returns:
+            agent_id -> 序列化的Agent数据
+        """
+        agents = {}
+        for agent_id, blob_name in refs.items():
+            agents[agent_id] = _read_checkpoint(self.blob_dir / blob_name)
+        return agents
+    
+    def cleanup_blobs(self) -> int:
+        """
+        删除不再被任何检查点引用的数据块
+        
+        引用关系从各检查点的元数据旁路文件读取（一次遍历汇总成集合）；
+        任一检查点无法读取时不删除任何数据块。
+        
+        注意：与保存之间的互斥只在同一个 CheckpointManager 实例内有效，
+        同一目录只应由一个实例（一个进程）管理——另一个实例正在写入、尚未被引用的数据块
+        可能被清理，其已知数据块缓存也不会感知清理结果
+        
+        Returns:
+            删除的数据块数量
+        """
+        if not self.blob_dir.is_dir():
+            return 0
+        
+        with self._blob_lock:
+            referenced = set()
+            for checkpoint_file in self.checkpoint_dir.iterdir():
+                if _checkpoint_name(checkpoint_file) is None:
+                    continue
+                try:
+                    referenced.update(self._read_blob_refs(checkpoint_file))
+                except Exception as e:
+                    self.logger.warning(f"无法读取检查点 {checkpoint_file}，跳过数据块清理: {e}")
+                    return 0
+            
+            # 持有锁时本实例没有正在进行的写入，残留的 .tmp 文件也一并清理
+            removed = 0
+            for blob_path in self.blob_dir.iterdir():
+                if blob_path.name in referenced:
+                    continue
+                blob_path.unlink(missing_ok=True)
+                self._known_blobs.discard(blob_path.name)
+                removed += 1
+        
+        if removed:
+            self.logger.info(f"已清理 {removed} 个未被引用的数据块")
+        return removed
+    
+    def _read_blob_refs(self, checkpoint_file: Path) -> List[str]:
+        """
+        读取检查点引用的数据块文件名
+        
+        Args:
+            checkpoint_file: 检查点文件路径
+            
+        Returns:
+            数据块文件名列表（完整检查点为空列表）
+        """
+        meta = self._read_meta(checkpoint_file)
+        if 'blobs' not in meta:
+            # 旁路文件缺少引用列表（由旧版本写入）：解析一次主体并更新旁路文件
+            meta = self._build_meta(_read_checkpoint(checkpoint_file))
+            _write_meta(_meta_path(checkpoint_file), meta)
+        return meta['blobs']
+    
     def _build_checkpoint_data(self, system: AgentSystem) -> Dict[str, Any]:
         """
         构建检查点数据
@@ -155,12 +454,13 @@ class CheckpointManager:
             },
             'agents': {},
             'system_state': {
-                'explore_agent': system.explore_agent.copy(),
-                'io_agents': system.io_agents.copy()
+                'explore_agent': system.explore_agent,
+                'io_agents': system.io_agents
             }
         }
         
         # 保存所有Agent的状态
+        # 容器直接引用、不做拷贝：检查点数据只用于紧接着的序列化，序列化过程只读
         for agent_id, agent in system.agents.items():
             # 跳过IOAgent（瞬态信息不需要保存）
             if isinstance(agent, (InputAgent, OutputAgent)):
@@ -199,8 +499,8 @@ class CheckpointManager:
         agent_data = {
             'id': agent.id,
             'state': agent.state,
-            'input_connection': agent.input_connection.copy(),
-            'output_connection': agent.output_connection.copy(),
+            'input_connection': agent.input_connection,
+            'output_connection': agent.output_connection,
             'input_cache': input_cache,  # 保存队列中的消息
             'pre_prompt': agent.pre_prompt,
             'class_name': agent.__class__.__name__
@@ -227,10 +527,11 @@ class CheckpointManager:
         """
         system = AgentSystem()
         
-        # 重建所有Agent
-        for agent_id, agent_data in checkpoint_data['agents'].items():
-            agent = self._deserialize_agent(agent_data)
-            system.add_agent(agent)
+        # 重建所有Agent，批量加入系统（消息总线只更新一次）
+        system.add_agents(
+            self._deserialize_agent(agent_data)
+            for agent_data in checkpoint_data['agents'].values()
+        )
         
         # 恢复系统状态
         system_state = checkpoint_data.get('system_state', {})
@@ -255,12 +556,14 @@ class CheckpointManager:
         # 创建新的Agent实例
         agent = Agent()
         
-        # 恢复Agent状态
-        agent.id = agent_data['id']
-        agent.state = agent_data['state']
-        agent.input_connection = agent_data['input_connection']
-        agent.output_connection = agent_data['output_connection']
-        agent.pre_prompt = agent_data['pre_prompt']
+        # 恢复Agent状态（Agent 是普通类，一次性写入实例字典）
+        agent.__dict__.update(
+            id=agent_data['id'],
+            state=agent_data['state'],
+            input_connection=agent_data['input_connection'],
+            output_connection=agent_data['output_connection'],
+            pre_prompt=agent_data['pre_prompt']
+        )
         
         # 将保存的input_cache放入队列
         input_cache = agent_data.get('input_cache', [])
@@ -281,20 +584,16 @@ class CheckpointManager:
         Args:
             system: AgentSystem实例
         """
-        # 确保所有Agent都正确连接到消息总线
-        for agent_id, agent in system.agents.items():
-            if agent.message_bus is None:
-                agent.message_bus = system.message_bus
-            if agent.system is None:
-                agent.system = system
-        
-        # 重新注册所有Agent到消息总线
-        for agent_id, agent in system.agents.items():
-            system.message_bus.register_agent(agent)
+        # 确保所有Agent都连接到消息总线，并一次性重新注册
+        bus = system.message_bus
+        for agent in system.agents.values():
+            agent.message_bus = bus
+            agent.system = system
+        bus.register_agents(system.agents.values())
     
     def delete_checkpoint(self, checkpoint_file: str) -> bool:
         """
-        删除检查点
+        删除检查点（连同元数据旁路文件）
         
         Args:
             checkpoint_file: 检查点文件路径
@@ -304,27 +603,62 @@ class CheckpointManager:
         """
         checkpoint_path = Path(checkpoint_file)
         
-        if not checkpoint_path.exists():
+        if _checkpoint_name(checkpoint_path) is None:
+            self.logger.warning(f"不是检查点文件: {checkpoint_file}")
+            return False
+        
+        meta_file = _meta_path(checkpoint_path)
+        checkpoint_exists = checkpoint_path.exists()
+        
+        if not checkpoint_exists and not meta_file.exists():
             self.logger.warning(f"检查点文件不存在: {checkpoint_file}")
             return False
         
+        # 只有增量检查点引用数据块；无法确定时按引用了数据块处理
+        references_blobs = True
+        if checkpoint_exists:
+            try:
+                references_blobs = bool(self._read_blob_refs(checkpoint_path))
+            except Exception:
+                pass
+        
         try:
-            checkpoint_path.unlink()
+            # 只删除属于该文件的旁路文件；检查点已不存在时也清理其残留的旁路文件
+            if checkpoint_exists:
+                checkpoint_path.unlink(missing_ok=True)
+            meta_file.unlink(missing_ok=True)
             self.logger.info(f"检查点已删除: {checkpoint_file}")
-            return True
         except Exception as e:
             self.logger.error(f"删除检查点失败: {e}")
             return False
+        
+        # 删除增量检查点后，它独占的数据块不再被引用；完整检查点不需要清理
+        if references_blobs:
+            try:
+                self.cleanup_blobs()
+            except Exception as e:
+                self.logger.warning(f"清理数据块失败: {e}")
+        return True
     
     def get_latest_checkpoint(self) -> Optional[str]:
         """
         获取最新的检查点文件路径
         
+        只比较文件修改时间，不读取元数据也不解析检查点内容
+        
         Returns:
             最新的检查点文件路径，如果没有则返回None
         """
-        checkpoints = self.list_checkpoints()
-        if not checkpoints:
-            return None
+        latest = None
+        latest_mtime = None
+        for checkpoint_file in self.checkpoint_dir.iterdir():
+            if _checkpoint_name(checkpoint_file) is None:
+                continue
+            try:
+                mtime = checkpoint_file.stat().st_mtime
+            except OSError:
+                continue
+            if latest_mtime is None or mtime > latest_mtime:
+                latest, latest_mtime = checkpoint_file, mtime
         
-        return checkpoints[0]['file']
\ No newline at end of file
+        return str(latest) if latest is not None else None
\ No newline at end of file
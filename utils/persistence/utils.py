@@ -10,39 +10,45 @@ from driver.agent_system import AgentSystem
 from utils.logger import LoggerFactory
 
 
+# 自动保存连续跳过时，保存间隔最多放大到基础间隔的倍数
+_AUTO_SAVE_MAX_BACKOFF = 8
+
+
 class PersistenceUtils:
     """
     持久化工具类
     """
     
-    def __init__(self, checkpoint_dir: str = "checkpoints"):
+    def __init__(self, checkpoint_dir: str = "checkpoints", compress: bool = False):
         """
         初始化持久化工具
         
         Args:
             checkpoint_dir: 检查点保存目录
+            compress: 是否以压缩格式保存检查点
         """
-        self.checkpoint_manager = CheckpointManager(checkpoint_dir)
+        self.checkpoint_manager = CheckpointManager(checkpoint_dir, compress)
         self.logger = LoggerFactory.get_logger("PersistenceUtils")
     
-    async def save_system_checkpoint(self, system: AgentSystem, checkpoint_name: Optional[str] = None) -> str:
+    async def save_system_checkpoint(self, system: AgentSystem, checkpoint_name: Optional[str] = None,
+                                     incremental: bool = False) -> str:
         """
         保存系统检查点（异步版本）
         
         Args:
             system: AgentSystem实例
             checkpoint_name: 检查点名称
+            incremental: 是否保存为增量检查点
             
         Returns:
             保存的检查点文件路径
         """
         # 在后台线程中执行保存操作以避免阻塞事件循环
-        loop = asyncio.get_event_loop()
-        checkpoint_file = await loop.run_in_executor(
-            None, 
-            self.checkpoint_manager.save_checkpoint, 
-            system, 
-            checkpoint_name
+        checkpoint_file = await asyncio.to_thread(
+            self.checkpoint_manager.save_checkpoint,
+            system,
+            checkpoint_name,
+            incremental
         )
         
         self.logger.info(f"异步保存检查点完成: {checkpoint_file}")
@@ -59,9 +65,7 @@ class PersistenceUtils:
             恢复的AgentSystem实例
         """
         # 在后台线程中执行加载操作
-        loop = asyncio.get_event_loop()
-        system = await loop.run_in_executor(
-            None,
+        system = await asyncio.to_thread(
             self.checkpoint_manager.load_checkpoint,
             checkpoint_file
         )
@@ -87,27 +91,49 @@ class PersistenceUtils:
         """
         return self.checkpoint_manager.get_latest_checkpoint()
     
-    async def auto_save(self, system: AgentSystem, interval: int = 300) -> asyncio.Task:
+    async def auto_save(self, system: AgentSystem, interval: int = 300,
+                        incremental: bool = False) -> asyncio.Task:
         """
         自动定期保存检查点
         
+        系统自上次保存以来没有变化（AgentSystem.mutation_counter 未变）时跳过保存，
+        并把下一次检查的间隔加倍（最多放大到 _AUTO_SAVE_MAX_BACKOFF 倍）；
+        间隔已达上限时无论计数是否变化都保存一次，兜底未经计数的变化；
+        保存后间隔恢复为 interval
+        
         Args:
             system: AgentSystem实例
             interval: 保存间隔（秒）
+            incremental: 是否保存为增量检查点（默认关闭；开启后未变化的Agent数据不再重复写入，
+                         但检查点依赖检查点目录下的 agents/ 数据块目录，不能单独拷贝）
             
         Returns:
             自动保存任务
         """
         async def auto_save_loop():
             save_count = 0
+            last_counter = None
+            delay = interval
+            max_delay = interval * _AUTO_SAVE_MAX_BACKOFF
             while True:
                 try:
-                    await asyncio.sleep(interval)
+                    await asyncio.sleep(delay)
+                    
+                    # 在保存前读取计数，保存期间发生的变化留给下一次保存
+                    counter = system.mutation_counter
+                    if counter == last_counter and delay < max_delay:
+                        delay = min(delay * 2, max_delay)
+                        self.logger.debug(f"系统无变化，跳过自动保存，下次检查间隔: {delay}秒")
+                        continue
+                    
                     checkpoint_file = await self.save_system_checkpoint(
                         system, 
-                        f"auto_save_{save_count:04d}"
+                        f"auto_save_{save_count:04d}",
+                        incremental
                     )
                     save_count += 1
+                    last_counter = counter
+                    delay = interval
                     self.logger.info(f"自动保存完成: {checkpoint_file}")
                 except asyncio.CancelledError:
                     self.logger.info("自动保存任务被取消")
@@ -7,6 +7,19 @@ import json
 import os
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# count_llm_calls 使用的记录标记：llm_call 记录没有 type 字段，用只有它才有的 model 键识别
+# （紧凑与带空格两种分隔符都以 "model": 开头，一个标记即可）
+_LLM_CALL_MARKER = b'"model":'
+_INPUT_MARKERS = (b'"type":"input_agent_message"', b'"type": "input_agent_message"')
+_OUTPUT_MARKERS = (b'"type":"output_agent_message"', b'"type": "output_agent_message"')
+
 def view_llm_logs(log_file: str = "logs/llm_calls.jsonl"):
     """
     查看LLM日志
@@ -20,11 +33,12 @@ def view_llm_logs(log_file: str = "logs/llm_calls.jsonl"):
     
     print(f"=== LLM调用日志 ({log_file}) ===\n")
     
-    with open(log_file, "r", encoding="utf-8") as f:
+    # 以二进制读取，直接交给解析器（不做逐行解码和 strip 复制）
+    with open(log_file, "rb") as f:
         for line_num, line in enumerate(f, 1):
             if line.strip():
                 try:
-                    log_entry = json.loads(line.strip())
+                    log_entry = _loads(line)
                     
                     # 根据类型显示不同的信息
                     log_type = log_entry.get("type", "llm_call")
@@ -57,9 +71,48 @@ def view_llm_logs(log_file: str = "logs/llm_calls.jsonl"):
                     
                 except json.JSONDecodeError as e:
                     print(f"[{line_num}] 解析错误: {e}")
-                    print(f"    原始行: {line.strip()}")
+                    print(f"    原始行: {line.strip().decode('utf-8', errors='replace')}")
                     print()
 
+def _count_records(data: bytes):
+    """
+    统计日志数据中三类记录的数量
+    
+    只需要三个计数，不解析 JSON：直接在字节上计数各类记录的标记（C 实现的子串搜索），
+    空行、空白行自然不计入。字符串内容中的引号都被转义为 \\"，不会误匹配；
+    类型标记的两种写法分别对应 orjson 的紧凑输出和 json 的默认分隔符。
+    写入器总是整行写入，末尾没有换行符的部分可能是写到一半的残缺记录，
+    只有能完整解析时才计入
+    
+    Args:
+        data: 日志文件内容
+        
+    Returns:
+        (LLM调用数, InputAgent消息数, OutputAgent消息数)
+    """
+    complete_end = data.rfind(b"\n") + 1
+    body, tail = data[:complete_end], data[complete_end:]
+    
+    llm_calls = body.count(_LLM_CALL_MARKER)
+    input_messages = sum(body.count(marker) for marker in _INPUT_MARKERS)
+    output_messages = sum(body.count(marker) for marker in _OUTPUT_MARKERS)
+    
+    if tail.strip():
+        try:
+            log_entry = _loads(tail)
+        except ValueError:
+            log_entry = None
+        if isinstance(log_entry, dict):
+            log_type = log_entry.get("type", "llm_call")
+            if log_type == "llm_call":
+                llm_calls += 1
+            elif log_type == "input_agent_message":
+                input_messages += 1
+            elif log_type == "output_agent_message":
+                output_messages += 1
+    
+    return llm_calls, input_messages, output_messages
+
 def count_llm_calls(log_file: str = "logs/llm_calls.jsonl"):
     """
     统计LLM调用次数
@@ -71,26 +124,10 @@ def count_llm_calls(log_file: str = "logs/llm_calls.jsonl"):
         print(f"日志文件不存在: {log_file}")
         return
     
-    llm_calls = 0
-    input_messages = 0
-    output_messages = 0
+    with open(log_file, "rb") as f:
+        data = f.read()
     
-    with open(log_file, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                try:
-                    log_entry = json.loads(line.strip())
-                    log_type = log_entry.get("type", "llm_call")
-                    
-                    if log_type == "llm_call":
-                        llm_calls += 1
-                    elif log_type == "input_agent_message":
-                        input_messages += 1
-                    elif log_type == "output_agent_message":
-                        output_messages += 1
-                        
-                except json.JSONDecodeError:
-                    continue
+    llm_calls, input_messages, output_messages = _count_records(data)
     
     print(f"=== 统计信息 ===")
     print(f"LLM调用次数: {llm_calls}")
@@ -6,6 +6,7 @@
 
 import json
 import os
+import sys
 import time
 import threading
 from pathlib import Path
@@ -61,6 +62,8 @@ class LogMonitor:
         self._observer: Optional[Observer] = None
         self._running = False
         self._lock = threading.Lock()
+        # 控制台回显：仅在 stdout 是终端时默认开启，重定向到文件/管道时不逐条写出
+        self._console_enabled = sys.stdout.isatty()
 
         # 拓扑状态
         self.agents: Dict[str, dict] = {}  # agent_id -> agent info
@@ -217,7 +220,7 @@ class LogMonitor:
                     conn['keyword'] = new_keyword
                     conn['type'] = 'input'  # 确保设置 type
                     updated = True
-            if updated:
+            if updated and self._console_enabled:
                 print(f"[LogMonitor] Updated input connection keyword: {current_id} '{old_keyword}' -> '{new_keyword}'")
 
         # 处理输出连接 keyword 更新
@@ -235,7 +238,7 @@ class LogMonitor:
                     conn['keyword'] = new_keyword
                     conn['type'] = 'output'  # 确保设置 type
                     updated = True
-            if updated:
+            if updated and self._console_enabled:
                 print(f"[LogMonitor] Updated output connection keyword: {current_id} '{old_keyword}' -> '{new_keyword}'")
 
         # 处理连接删除
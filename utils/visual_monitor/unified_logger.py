@@ -7,13 +7,16 @@
 
 import json
 import os
+import sys
 import time
-import asyncio
 import logging
 from typing import Dict, Any, Optional
 from pathlib import Path
 from enum import Enum, auto
 
+from utils.async_monitor import AsyncMonitor
+from utils.log_writer import BackgroundLogWriter
+
 
 class LogMode(Enum):
     """日志模式枚举"""
@@ -27,33 +30,29 @@ class UnifiedLogger:
     统一日志记录器
     所有日志都输出为 JSONL 格式到 logs/system.jsonl
     根据模式不同，输出不同详细程度的数据
+    使用模块级实例 unified_logger，不要重复创建（每个实例各自打开一个写入线程）
     """
 
-    _instance = None
-    _fh = None
+    _writer: Optional[BackgroundLogWriter] = None
     _mode = LogMode.CONTENT
-
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    # 由 set_mode 预先计算，log() 中只做布尔判断
+    _include_object_refs = False
+    _include_async_context = False
 
     def __init__(self, log_dir: str = "logs"):
-        if hasattr(self, '_initialized') and self._initialized:
-            return
-
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
         # 统一日志文件
         self.log_file = self.log_dir / "system.jsonl"
-        self._fh = open(self.log_file, 'a', encoding='utf-8')
-
-        self._initialized = True
+        # 文件写入交给后台线程，调用方只负责序列化和入队
+        self._writer = BackgroundLogWriter(self.log_file, 'a')
 
     @classmethod
     def set_mode(cls, mode: LogMode):
         cls._mode = mode
+        cls._include_object_refs = mode.value >= LogMode.DETAIL.value
+        cls._include_async_context = mode.value >= LogMode.ARCH.value
 
     @classmethod
     def get_mode(cls) -> LogMode:
@@ -69,56 +68,6 @@ class UnifiedLogger:
             refs['object_addr'] = hex(id(obj))
         return refs
 
-    def _collect_async_context(self) -> Dict[str, Any]:
-        """收集异步框架上下文信息"""
-        context = {
-            "current_task": None,
-            "all_tasks": [],
-            "event_loop": None
-        }
-
-        try:
-            try:
-                current_task = asyncio.current_task()
-                if current_task:
-                    coro = current_task.get_coro()
-                    context["current_task"] = {
-                        "task_id": id(current_task),
-                        "task_name": current_task.get_name(),
-                        "coro_name": getattr(coro, '__qualname__', str(coro)),
-                        "stack_depth": len(current_task.get_stack()) if hasattr(current_task, 'get_stack') else 0
-                    }
-            except RuntimeError:
-                pass
-
-            try:
-                all_tasks = asyncio.all_tasks()
-                context["all_tasks"] = [
-                    {
-                        "task_id": id(t),
-                        "task_name": t.get_name(),
-                        "coro_name": getattr(t.get_coro(), '__qualname__', str(t.get_coro()))
-                    }
-                    for t in all_tasks
-                ]
-            except RuntimeError:
-                pass
-
-            try:
-                loop = asyncio.get_event_loop()
-                context["event_loop"] = {
-                    "loop_id": id(loop),
-                    "is_running": loop.is_running(),
-                    "is_closed": loop.is_closed(),
-                    "default_executor": loop._default_executor is not None if hasattr(loop, '_default_executor') else None
-                }
-            except RuntimeError:
-                pass
-        except Exception as e:
-            context["error"] = str(e)
-
-        return context
-
     def log(self, level: str, source: str, event_type: str, data: Dict[str, Any],
             object_refs: Optional[Dict[str, Any]] = None, include_async: bool = False):
         """
@@ -141,22 +90,22 @@ class UnifiedLogger:
         }
 
         # 根据模式添加不同详细程度的信息
-        if self._mode.value >= LogMode.DETAIL.value:
+        if self._include_object_refs:
             entry["object_refs"] = object_refs or {}
 
-        if self._mode.value >= LogMode.ARCH.value or include_async:
-            entry["async_context"] = self._collect_async_context()
+        if include_async or self._include_async_context:
+            entry["async_context"] = AsyncMonitor.collect_log_context()
 
+        # 异步上下文依赖当前线程的事件循环，必须在调用方线程序列化
         try:
-            self._fh.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
-            self._fh.flush()
+            self._writer.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
         except Exception as e:
             print(f"UnifiedLogger write error: {e}")
 
     def close(self):
-        if self._fh:
-            self._fh.close()
-            self._fh = None
+        if self._writer:
+            self._writer.close()
+            self._writer = None
 
     def __del__(self):
         self.close()
@@ -222,7 +171,8 @@ def _init_from_env():
     }
     if mode_str in mode_map:
         UnifiedLogger.set_mode(mode_map[mode_str])
-        print(f"UnifiedLogger mode: {mode_str}")
+        if sys.stdout.isatty():
+            print(f"UnifiedLogger mode: {mode_str}")
 
 
 _init_from_env()